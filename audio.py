@@ -2,20 +2,50 @@
 
 import asyncio
 import logging
-from typing import AsyncIterator
+from fractions import Fraction
+from functools import lru_cache
+from typing import AsyncIterator, Callable
 
 import numpy as np
-from scipy.signal import resample
+from scipy.signal import firwin, resample_poly
 
 logger = logging.getLogger(__name__)
 
+# float32 scalars so int16 <-> float conversions never promote to float64
+_INT16_SCALE = np.float32(32767.0)
+_INT16_INV_SCALE = np.float32(1.0 / 32767.0)
+
+
+@lru_cache(maxsize=8)
+def resample_ratio(src_rate: int, dst_rate: int) -> tuple[int, int]:
+    """Return the reduced (up, down) factors for resampling src_rate -> dst_rate."""
+    ratio = Fraction(dst_rate, src_rate).limit_denominator(1000)
+    return ratio.numerator, ratio.denominator
+
+
+@lru_cache(maxsize=8)
+def resample_filter(up: int, down: int) -> np.ndarray:
+    """Design the Kaiser-windowed FIR that resample_poly uses for up/down.
+
+    Passing it as ``window`` skips resample_poly's per-call filter design,
+    which dominates the cost on short 20ms chunks.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    taps.setflags(write=False)
+    return taps
+
 
 def audio_to_int16(audio: np.ndarray) -> np.ndarray:
     """Convert audio to int16 format, handling both float and int inputs."""
     if audio.dtype == np.int16:
         return audio
     if audio.dtype in (np.float32, np.float64):
-        return (audio * 32767).astype(np.int16)
+        # Scale in float32 (no float64 hop) and clip in place before the cast
+        scaled = np.multiply(audio, _INT16_SCALE, dtype=np.float32)
+        np.clip(scaled, -32768, 32767, out=scaled)
+        return scaled.astype(np.int16)
     return audio.astype(np.int16)
 
 
@@ -24,7 +54,7 @@ def audio_to_float32(audio: np.ndarray) -> np.ndarray:
     if audio.dtype == np.float32:
         return audio
     if audio.dtype == np.int16:
-        return audio.astype(np.float32) / 32767.0
+        return np.multiply(audio, _INT16_INV_SCALE, dtype=np.float32)
     return audio.astype(np.float32)
 
 
@@ -49,6 +79,44 @@ class AudioStream:
         self._max_empty_reads = 25
         self._empty_read_sleep_seconds = 0.02
 
+        # Robot sample rates and resample (up, down) factors, cached at start()
+        # so the per-chunk path makes no SDK calls
+        self._robot_in_rate = 0
+        self._robot_out_rate = 0
+        self._in_ratio: tuple[int, int] | None = None
+        self._out_ratio: tuple[int, int] | None = None
+        self._in_filter: np.ndarray | None = None
+        self._out_filter: np.ndarray | None = None
+
+        # Channel-0 extractor for the mic's buffer layout, picked on first read
+        self._extract_channel: Callable[[np.ndarray], np.ndarray] | None = None
+
+    @staticmethod
+    def _channel_extractor(sample: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        """Return a function taking channel 0 from buffers shaped like sample."""
+        if sample.ndim != 2:
+            return lambda s: s
+        # Scipy channels last convention; index channel 0 directly
+        # instead of transposing channels-first buffers
+        if sample.shape[1] > sample.shape[0]:
+            return lambda s: s[0]
+        return lambda s: s[:, 0]
+
+    def _cache_audio_rates(self, media) -> None:
+        """Cache the robot's sample rates and the resample factors they need."""
+        self._robot_in_rate = media.get_input_audio_samplerate()
+        self._robot_out_rate = media.get_output_audio_samplerate()
+
+        self._in_ratio = self._in_filter = None
+        if self._robot_in_rate > 0 and self._robot_in_rate != self.input_sample_rate:
+            self._in_ratio = resample_ratio(self._robot_in_rate, self.input_sample_rate)
+            self._in_filter = resample_filter(*self._in_ratio)
+
+        self._out_ratio = self._out_filter = None
+        if self._robot_out_rate > 0 and self._robot_out_rate != self.output_sample_rate:
+            self._out_ratio = resample_ratio(self.output_sample_rate, self._robot_out_rate)
+            self._out_filter = resample_filter(*self._out_ratio)
+
     async def _read_audio_sample(self, media) -> np.ndarray | bytes | None:
         """Read one audio sample with timeout protection."""
         try:
@@ -64,6 +132,11 @@ class AudioStream:
             logger.error(f"Audio input read failed: {exc}")
             return None
 
+    async def _drain_audio_sample(self) -> None:
+        """Read and discard one mic sample without resampling or converting it."""
+        if self._robot and self._robot._robot:
+            await self._read_audio_sample(self._robot._robot.media)
+
     async def _restart_audio_input(self, media) -> None:
         """Restart the audio recording stream after a stall."""
         try:
@@ -72,6 +145,8 @@ class AudioStream:
             logger.debug(f"Audio stop_recording failed: {exc}")
         try:
             await asyncio.to_thread(media.start_recording)
+            await asyncio.to_thread(self._cache_audio_rates, media)
+            self._extract_channel = None
         except Exception as exc:
             logger.warning(f"Audio start_recording failed: {exc}")
 
@@ -88,6 +163,7 @@ class AudioStream:
         # Start playback stream
         media.start_playing()
 
+        self._cache_audio_rates(media)
         self._running = True
 
     async def stop(self) -> None:
@@ -104,9 +180,9 @@ class AudioStream:
 
         Uses the same simple approach as the working reachy_mini_conversation_app:
         - Take channel 0 for mono
-        - Resample with scipy.signal.resample (higher quality)
+        - Resample with scipy.signal.resample_poly (polyphase FIR)
         - Convert to int16
-        - No gain boost or clipping
+        - No gain boost
         """
         if not self._robot or not self._robot._robot:
             return None
@@ -124,20 +200,21 @@ class AudioStream:
             if sample.size == 0:
                 return b""
 
-            # Handle multi-channel: take channel 0 only
-            if sample.ndim == 2:
-                # Scipy channels last convention - transpose if needed
-                if sample.shape[1] > sample.shape[0]:
-                    sample = sample.T
-                # Take first channel
-                if sample.shape[1] > 1:
-                    sample = sample[:, 0]
+            # Handle multi-channel: take channel 0 only (layout is stable per mic)
+            if self._extract_channel is None:
+                self._extract_channel = self._channel_extractor(sample)
+            sample = self._extract_channel(sample)
+
+            # Fast path: already at the API rate and int16, just emit bytes
+            if self._in_ratio is None and sample.dtype == np.int16:
+                return sample.tobytes()
 
             # Resample if needed (robot sample rate -> API's expected rate)
-            robot_rate = media.get_input_audio_samplerate()
-            if robot_rate != self.input_sample_rate and robot_rate > 0:
-                new_length = int(len(sample) * self.input_sample_rate / robot_rate)
-                sample = await asyncio.to_thread(resample, sample, new_length)
+            if self._in_ratio is not None:
+                up, down = self._in_ratio
+                sample = await asyncio.to_thread(
+                    resample_poly, sample, up, down, window=self._in_filter
+                )
 
             # Convert to int16 PCM
             sample = audio_to_int16(sample)
@@ -158,7 +235,7 @@ class AudioStream:
             try:
                 # Skip mic input while robot is speaking (prevent feedback loop)
                 if self._is_speaking:
-                    await self.read_audio()  # drain buffer
+                    await self._drain_audio_sample()
                     await asyncio.sleep(0.02)
                     continue
 
@@ -178,6 +255,27 @@ class AudioStream:
                 logger.error(f"Error reading audio: {e}")
                 await asyncio.sleep(0.1)
 
+    def _push_audio_chunks(self, media, audio_array: np.ndarray) -> None:
+        """Push audio to the speaker in small chunks until done or interrupted.
+
+        Runs in a worker thread so the event loop is not hopped per chunk.
+        """
+        chunk_samples = 480  # ~20ms at 24kHz for faster barge-in
+
+        # Row views over the whole-chunk prefix share its buffer; the short
+        # tail (if any) is pushed last without padding the array
+        n_full = len(audio_array) - len(audio_array) % chunk_samples
+        chunks = list(audio_array[:n_full].reshape(-1, chunk_samples))
+        if n_full < len(audio_array):
+            chunks.append(audio_array[n_full:])
+
+        for chunk in chunks:
+            if self._stop_speaking_event.is_set():
+                logger.debug("Speech interrupted")
+                break
+
+            media.push_audio_sample(chunk)
+
     async def play_audio(self, audio_data: bytes) -> None:
         """Play audio data through the robot's speaker."""
         if not self._robot or not self._robot._robot:
@@ -193,28 +291,15 @@ class AudioStream:
             audio_array = audio_to_float32(np.frombuffer(audio_data, dtype=np.int16))
 
             # Resample if needed (API's 24kHz -> robot's output rate)
-            robot_out_rate = media.get_output_audio_samplerate()
-            if robot_out_rate != self.output_sample_rate and robot_out_rate > 0:
-                new_length = int(
-                    len(audio_array) * robot_out_rate / self.output_sample_rate
+            if self._out_ratio is not None:
+                up, down = self._out_ratio
+                audio_array = await asyncio.to_thread(
+                    resample_poly, audio_array, up, down, window=self._out_filter
                 )
-                audio_array = await asyncio.to_thread(resample, audio_array, new_length)
                 audio_array = audio_array.astype(np.float32)
 
-            # Play in chunks to allow interruption
-            chunk_samples = 480  # ~20ms at 24kHz for faster barge-in
-            loop = asyncio.get_event_loop()
-
-            for i in range(0, len(audio_array), chunk_samples):
-                if self._stop_speaking_event.is_set():
-                    logger.debug("Speech interrupted")
-                    break
-
-                chunk = audio_array[i : i + chunk_samples]
-                await loop.run_in_executor(None, media.push_audio_sample, chunk)
-
-                # Small yield to allow other tasks
-                await asyncio.sleep(0.001)
+            # Play in chunks to allow interruption, all from one worker thread
+            await asyncio.to_thread(self._push_audio_chunks, media, audio_array)
 
         except Exception as e:
             logger.error(f"Error playing audio: {e}")
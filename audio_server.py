@@ -2,38 +2,76 @@
 """Simple audio playback server for Reachy Mini.
 
 Plays WAV files via HTTP without importing the Reachy SDK.
-Tries multiple playback methods: GStreamer, paplay, aplay.
+Keeps a sounddevice output stream open when available, otherwise
+tries multiple playback methods: GStreamer, paplay, aplay.
 
 Run on the robot:
     python3 audio_server.py
 """
 
 import asyncio
+import io
 import logging
 import subprocess
 import tempfile
 import os
 import shutil
+import wave
 from aiohttp import web
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# sounddevice is optional (needs PortAudio) - falls back to spawning a player
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDDEVICE_AVAILABLE = False
+
 PORT = 9000
 
+# Shared ALSA device on Reachy Mini (defined in ~/.asoundrc)
+SINK_DEVICE = 'reachymini_audio_sink'
+SINK_SAMPLE_RATE = 24000
+
+# WAV sample width (bytes) -> sounddevice raw dtype
+SINK_DTYPES = {1: 'uint8', 2: 'int16', 3: 'int24', 4: 'int32'}
+
+# Open output streams keyed by (rate, channels, dtype); writes are serialized
+_sinks = {}
+_sink_lock = asyncio.Lock()
+_use_sink = False
+
+# Players that cannot read stdin get one reused WAV path, on tmpfs when possible
+WAV_PATH = os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+    f'audio_server_{os.getpid()}.wav',
+)
+_wav_path_lock = asyncio.Lock()
+
 # Find available audio player at startup
 AUDIO_PLAYER = None
 AUDIO_ARGS = []
+# Argument telling the player to read WAV data from stdin (None = file only)
+AUDIO_STDIN_ARG = None
+
+# Pre-spawned player waiting on stdin, so a request skips fork+exec;
+# the lock keeps concurrent requests from spawning or taking it twice
+_warm_proc = None
+_warm_lock = asyncio.Lock()
+_prewarm_tasks = set()
 
 def find_audio_player():
     """Find an available audio player."""
-    global AUDIO_PLAYER, AUDIO_ARGS
+    global AUDIO_PLAYER, AUDIO_ARGS, AUDIO_STDIN_ARG
 
     # On Reachy Mini, use aplay with shared dmix device first
     # This allows mixing with the daemon's audio
     if shutil.which('aplay') and os.path.exists(os.path.expanduser('~/.asoundrc')):
         AUDIO_PLAYER = 'aplay'
         AUDIO_ARGS = ['-D', 'reachymini_audio_sink']
+        AUDIO_STDIN_ARG = '-'
         logger.info("Using aplay with reachymini_audio_sink (shared device)")
         return
 
@@ -41,6 +79,7 @@ def find_audio_player():
     if shutil.which('paplay'):
         AUDIO_PLAYER = 'paplay'
         AUDIO_ARGS = []
+        AUDIO_STDIN_ARG = ''
         logger.info("Using paplay for audio")
         return
 
@@ -55,6 +94,7 @@ def find_audio_player():
     if shutil.which('mpv'):
         AUDIO_PLAYER = 'mpv'
         AUDIO_ARGS = ['--no-video', '--really-quiet']
+        AUDIO_STDIN_ARG = '-'
         logger.info("Using mpv for audio")
         return
 
@@ -62,6 +102,7 @@ def find_audio_player():
     if shutil.which('ffplay'):
         AUDIO_PLAYER = 'ffplay'
         AUDIO_ARGS = ['-nodisp', '-autoexit', '-loglevel', 'quiet']
+        AUDIO_STDIN_ARG = '-'
         logger.info("Using ffplay for audio")
         return
 
@@ -69,32 +110,128 @@ def find_audio_player():
     if shutil.which('aplay'):
         AUDIO_PLAYER = 'aplay'
         AUDIO_ARGS = ['-D', 'default']
+        AUDIO_STDIN_ARG = '-'
         logger.warning("Using aplay with default (may conflict with daemon)")
         return
 
     logger.error("No audio player found!")
 
 
+def _get_sink(rate: int, channels: int, dtype: str):
+    """Return an open output stream for this format, opening it on first use."""
+    key = (rate, channels, dtype)
+    stream = _sinks.get(key)
+    if stream is None:
+        device = SINK_DEVICE if os.path.exists(os.path.expanduser('~/.asoundrc')) else None
+        stream = sd.RawOutputStream(
+            samplerate=rate, channels=channels, dtype=dtype, device=device
+        )
+        stream.start()
+        _sinks[key] = stream
+    return stream
+
+
+def _write_sink(wav_data: bytes) -> None:
+    """Decode the WAV header and write its frames to the persistent stream."""
+    with wave.open(io.BytesIO(wav_data), 'rb') as wf:
+        stream = _get_sink(
+            wf.getframerate(), wf.getnchannels(), SINK_DTYPES[wf.getsampwidth()]
+        )
+        frames = wf.readframes(wf.getnframes())
+    stream.write(frames)
+
+
+def open_output_sink():
+    """Open the default in-process output stream at startup."""
+    global _use_sink
+
+    if not SOUNDDEVICE_AVAILABLE:
+        logger.info("sounddevice not installed, using external player")
+        return
+
+    try:
+        _get_sink(SINK_SAMPLE_RATE, 1, 'int16')
+        _use_sink = True
+        logger.info("Using persistent sounddevice output stream")
+    except Exception as e:
+        logger.warning(f"Could not open sounddevice stream, using external player: {e}")
+
+
+async def _spawn_stdin_player():
+    """Start the audio player reading WAV data from stdin."""
+    cmd = [AUDIO_PLAYER] + AUDIO_ARGS
+    if AUDIO_STDIN_ARG:
+        cmd.append(AUDIO_STDIN_ARG)
+    return await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+
+async def _prewarm_player():
+    """Spawn a spare stdin player for the next request, unless one is waiting."""
+    global _warm_proc
+
+    async with _warm_lock:
+        if _warm_proc is not None and _warm_proc.returncode is None:
+            return
+        try:
+            _warm_proc = await _spawn_stdin_player()
+        except Exception as e:
+            _warm_proc = None
+            logger.debug(f"Could not pre-warm audio player: {e}")
+
+
+async def _take_stdin_player():
+    """Hand out the pre-warmed player and spawn its replacement in the background."""
+    global _warm_proc
+
+    async with _warm_lock:
+        proc, _warm_proc = _warm_proc, None
+    if proc is None or proc.returncode is not None:
+        proc = await _spawn_stdin_player()
+    task = asyncio.create_task(_prewarm_player())
+    _prewarm_tasks.add(task)
+    task.add_done_callback(_prewarm_tasks.discard)
+    return proc
+
+
 async def play_wav(wav_data: bytes) -> bool:
-    """Play WAV using available audio player."""
+    """Play WAV using the persistent stream, or the available audio player."""
+    if _use_sink:
+        try:
+            async with _sink_lock:
+                await asyncio.to_thread(_write_sink, wav_data)
+            return True
+        except Exception as e:
+            logger.warning(f"Stream playback failed, falling back to player: {e}")
+
     if not AUDIO_PLAYER:
         logger.error("No audio player available")
         return False
 
     try:
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            f.write(wav_data)
-            temp_path = f.name
-
-        cmd = [AUDIO_PLAYER] + AUDIO_ARGS + [temp_path]
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
-
-        os.unlink(temp_path)
+        if AUDIO_STDIN_ARG is not None:
+            # Pipe the WAV bytes straight into the player, no disk roundtrip
+            proc = await _take_stdin_player()
+            _, stderr = await asyncio.wait_for(
+                proc.communicate(wav_data), timeout=60
+            )
+        else:
+            # The path is shared, so hold it until the player is done reading
+            async with _wav_path_lock:
+                with open(WAV_PATH, 'wb') as f:
+                    f.write(wav_data)
+
+                cmd = [AUDIO_PLAYER] + AUDIO_ARGS + [WAV_PATH]
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
 
         if proc.returncode != 0:
             logger.error(f"{AUDIO_PLAYER} error: {stderr.decode()}")
@@ -129,15 +266,16 @@ async def handle_status(request):
     return web.json_response({
         "service": "audio_server",
         "port": PORT,
-        "player": AUDIO_PLAYER or "none"
+        "player": "sounddevice" if _use_sink else (AUDIO_PLAYER or "none")
     })
 
 
 async def main():
     """Run the audio server."""
     find_audio_player()
+    open_output_sink()
 
-    if not AUDIO_PLAYER:
+    if not AUDIO_PLAYER and not _use_sink:
         logger.error("No audio player found - server will not work")
         return
 
@@ -146,6 +284,9 @@ async def main():
     app.router.add_get('/status', handle_status)
     app.router.add_get('/', handle_status)
 
+    if AUDIO_STDIN_ARG is not None and not _use_sink:
+        await _prewarm_player()
+
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, '0.0.0.0', PORT)
@@ -160,6 +301,14 @@ async def main():
     except KeyboardInterrupt:
         pass
     finally:
+        for task in list(_prewarm_tasks):
+            task.cancel()
+        if _warm_proc and _warm_proc.returncode is None:
+            _warm_proc.kill()
+        for stream in _sinks.values():
+            stream.close()
+        if os.path.exists(WAV_PATH):
+            os.unlink(WAV_PATH)
         await runner.cleanup()
 
 
@@ -8,6 +8,10 @@ import numpy as np
 sys.path.insert(0, '/restore/venvs/mini_daemon/lib/python3.12/site-packages')
 from reachy_mini import ReachyMini
 
+# float32 scale factors so PCM normalization never allocates float64
+INT16_SCALE = np.float32(1.0 / 32768.0)
+INT8_SCALE = np.float32(1.0 / 128.0)
+
 def play_wav(wav_path):
     robot = ReachyMini(media_backend="default")
     
@@ -17,17 +21,21 @@ def play_wav(wav_path):
         nc = wf.getnchannels()
         sw = wf.getsampwidth()
     
-    # Convert to float32 normalized
+    # View the raw frames without copying (SDK only takes float32)
     if sw == 2:
-        audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+        pcm, scale = np.frombuffer(frames, dtype=np.int16), INT16_SCALE
     else:
-        audio = np.frombuffer(frames, dtype=np.int8).astype(np.float32) / 128.0
+        pcm, scale = np.frombuffer(frames, dtype=np.int8), INT8_SCALE
     
-    # SDK expects stereo
+    # SDK expects stereo: normalize straight into the one output buffer
     if nc == 1:
-        audio = np.column_stack([audio, audio])
-    elif nc == 2:
-        audio = audio.reshape(-1, 2)
+        audio = np.empty((pcm.shape[0], 2), dtype=np.float32)
+        np.multiply(pcm, scale, out=audio[:, 0])
+        audio[:, 1] = audio[:, 0]
+    else:
+        audio = np.multiply(pcm, scale, dtype=np.float32)
+        if nc == 2:
+            audio = audio.reshape(-1, 2)
     
     print(f"Playing {len(audio)} samples at {sr}Hz...")
     
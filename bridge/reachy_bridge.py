@@ -8,7 +8,7 @@ When speech detected, PUSHes audio to macOS server immediately.
 
 Cooper's Push Architecture:
 1. Background thread continuously records 1-sec chunks via SDK
-2. Local noise gate (0.02 threshold) — only process speech
+2. Local noise gate (hysteretic RMS) — only process speech
 3. When speech detected, immediately POST to macOS server
 4. HTTP server for playback, emotions, control (legacy endpoints)
 
@@ -17,6 +17,7 @@ Adapted from coopergwrenn/clawd-reachy patterns.
 Endpoints:
   POST /play        — play wav audio (raw bytes)
   POST /play/base64 — play base64-encoded wav audio
+  POST /play_stream?rate=24000 — play raw mono s16le PCM as it arrives (chunked ok)
   GET  /listen      — manual recording (legacy compatibility)
   POST /emotion/<name> — play emotion animation
   POST /dance/<name>   — play dance
@@ -26,7 +27,7 @@ Endpoints:
   POST /sleep       — put robot to sleep
   POST /stop        — stop current movement
   POST /goto        — move head/antennas
-  POST /configure   — set macOS endpoint
+  POST /configure   — set macOS endpoint (and optional "compression": "ulaw")
 
 Background Thread:
   Continuous SDK recording → noise gate → POST to macOS when speech detected
@@ -45,21 +46,42 @@ import json
 import base64
 import wave
 import io
+import queue
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 import numpy as np
 import argparse
 import socket
+import struct
 import cv2
 import subprocess
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
 
 # Add the Reachy SDK to path
 sys.path.insert(0, '/restore/venvs/mini_daemon/lib/python3.12/site-packages')
 
+# libjpeg-turbo (NEON SIMD on the Pi) for snapshot encoding, if installed
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbojpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+    TURBOJPEG_AVAILABLE = False
+
 REACHY_API = "http://127.0.0.1:8000"
 BRIDGE_PORT = 9000
 
+# Keep-alive HTTP session shared by daemon calls and macOS pushes
+_http = requests.Session()
+_http.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+# Workers that send animation gotos so round-trips overlap the step sleeps
+_goto_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='goto')
+
 # Custom animations (head movements via goto API)
 CUSTOM_ANIMATIONS = {
     "look": [
@@ -120,15 +142,52 @@ CUSTOM_ANIMATIONS = {
     ],
 }
 
+def _compile_animation(steps):
+    """Pre-encode each step's goto payload as JSON bytes: [(body, sleep), ...]."""
+    compiled = []
+    for step in steps:
+        payload = {
+            "head_pose": {
+                "x": 0,
+                "y": 0,
+                "z": step.get("head_z", 0),
+                "roll": step.get("head_roll", 0),
+                "pitch": step.get("head_pitch", 0),
+                "yaw": step.get("head_yaw", 0),
+            },
+            "antennas_position": step.get("antennas", [0.4, 0.4]),
+            "duration": step.get("duration", 0.5),
+        }
+        compiled.append((json.dumps(payload).encode(), step.get("sleep", 0)))
+    return compiled
+
+# Animations are static, so their goto bodies are encoded once at import
+CUSTOM_ANIMATIONS_COMPILED = {
+    name: _compile_animation(steps) for name, steps in CUSTOM_ANIMATIONS.items()
+}
+
 # Cooper's settings
 CHUNK_DURATION = 1.0  # 1-second chunks for fast detection
-NOISE_THRESHOLD = 0.02  # Cooper's noise gate threshold
+# Noise gate on chunk RMS, with hysteresis. The default open level matches the
+# old 0.02 peak gate for a steady signal with a 12 dB crest factor
+# (0.02 / 4); voice with pauses has a higher crest factor and needs to be a
+# little louder. Close is 6 dB lower. Tune per mic with --gate-open-rms /
+# --gate-close-rms (or GATE_OPEN_RMS / GATE_CLOSE_RMS) against the rms= the
+# listener logs for silence and for speech.
+GATE_OPEN_RMS = float(os.environ.get('GATE_OPEN_RMS', 0.005))
+GATE_CLOSE_RMS = float(os.environ.get('GATE_CLOSE_RMS', GATE_OPEN_RMS / 2))
 SILENCE_CHUNKS_TO_TRIGGER = 2  # Buffer speech chunks until this many silent chunks
+MAX_UTTERANCE_SECONDS = 10  # Longer speech is pushed in pieces of this length
+MAX_LISTEN_SECONDS = 30  # Upper bound for GET /listen?duration=
+SAMPLE_RATE = 16000  # SDK microphone rate
+CHUNK_SAMPLES = int(SAMPLE_RATE * CHUNK_DURATION)
+MIC_RING_SECONDS = 4  # Mic history kept by the background reader
 
 # Global state
 robot = None
 macos_host = None
 macos_port = 8888  # Default port for macOS voice server
+upload_compression = None  # None (16-bit PCM) or "ulaw", set via /configure
 listening_thread = None
 listening_active = False
 
@@ -140,6 +199,119 @@ def init_robot():
     robot = ReachyMini(media_backend="default")
     print("✅ ReachyMini SDK connected!", flush=True)
 
+class AudioRingBuffer:
+    """Fixed-size mono float32 ring written by the mic reader thread.
+
+    Readers keep their own cursor (total samples consumed) and block until
+    enough new samples have been written past it.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buf = np.zeros(capacity, dtype=np.float32)
+        self.written = 0  # Total samples ever written
+        self._cond = threading.Condition()
+
+    def write(self, samples):
+        """Copy samples into the ring, wrapping at the end."""
+        n = len(samples)
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+        m = len(samples)
+        start = (self.written + n - m) % self.capacity
+        first = min(m, self.capacity - start)
+        self.buf[start:start + first] = samples[:first]
+        self.buf[:m - first] = samples[first:]
+        with self._cond:
+            self.written += n
+            self._cond.notify_all()
+
+    def read_next(self, cursor, n, timeout, out=None):
+        """Return (samples, new_cursor) for the n samples after cursor, or (None, cursor) on timeout.
+
+        Samples are copied into out when given, otherwise into a new array.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.written - cursor >= n, timeout):
+                return None, cursor
+            # Skip ahead if the reader fell more than a full ring behind
+            cursor = max(cursor, self.written - self.capacity)
+        start = cursor % self.capacity
+        first = min(n, self.capacity - start)
+        if out is None:
+            out = np.empty(n, dtype=np.float32)
+        out[:first] = self.buf[start:start + first]
+        out[first:] = self.buf[:n - first]
+        return out, cursor + n
+
+# Microphone: background reader feeding the ring buffer
+_mic_ring = AudioRingBuffer(SAMPLE_RATE * MIC_RING_SECONDS)
+_mic_thread = None
+_mic_active = False
+
+def _mic_reader():
+    """Background thread: keep recording open and drain SDK samples into the ring."""
+    print("🎤 Mic reader starting...", flush=True)
+    robot.media.start_recording()
+    try:
+        while _mic_active:
+            # Read again as soon as a sample lands; only back off when the
+            # SDK has nothing buffered yet
+            s = robot.media.get_audio_sample()
+            if s is not None and len(s) > 0:
+                _mic_ring.write(s[:, 0] if s.ndim > 1 else s)
+            else:
+                time.sleep(0.01)
+    except Exception as e:
+        print(f"❌ Mic reader error: {e}", flush=True)
+    finally:
+        robot.media.stop_recording()
+        print("🎤 Mic reader stopped", flush=True)
+
+def start_mic_reader():
+    """Start the background mic reader if it is not running."""
+    global _mic_thread, _mic_active
+    if _mic_thread and _mic_thread.is_alive():
+        return
+    _mic_active = True
+    _mic_thread = threading.Thread(target=_mic_reader, daemon=True)
+    _mic_thread.start()
+
+def wav_header(data_size, ulaw=False):
+    """Return the 44-byte WAV header for data_size bytes of mono mic audio.
+
+    The data is 16-bit PCM, or 8-bit G.711 mu-law (format tag 7) if ulaw.
+    """
+    fmt_tag, width = (7, 1) if ulaw else (1, 2)
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, fmt_tag, 1, SAMPLE_RATE, SAMPLE_RATE * width, width, width * 8,
+        b'data', data_size,
+    )
+
+# G.711 mu-law segment end points (14-bit magnitudes)
+_ULAW_SEG_END = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32)
+
+def ulaw_encode(pcm):
+    """Encode int16 samples to G.711 mu-law bytes (matches audioop.lin2ulaw)."""
+    x = pcm.astype(np.int32) >> 2
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    mag = np.minimum(np.abs(x), 8159) + 0x21
+    seg = np.searchsorted(_ULAW_SEG_END, mag)
+    uval = np.where(seg >= 8, 0x7F, (np.minimum(seg, 7) << 4) | ((mag >> (seg + 1)) & 0x0F))
+    return (uval ^ mask).astype(np.uint8).tobytes()
+
+# Per-thread (float32, int16) chunk buffers reused by record_chunk_sdk
+_chunk_buffers = threading.local()
+
+def _chunk_scratch():
+    """Return this thread's preallocated chunk buffers."""
+    if not hasattr(_chunk_buffers, 'f32'):
+        _chunk_buffers.f32 = np.empty(CHUNK_SAMPLES, dtype=np.float32)
+        _chunk_buffers.i16 = np.empty(CHUNK_SAMPLES, dtype=np.int16)
+    return _chunk_buffers.f32, _chunk_buffers.i16
+
 def get_default_macos_host():
     """Get the first non-localhost IP to use as default macOS host."""
     try:
@@ -154,69 +326,73 @@ def get_default_macos_host():
     except:
         return "192.168.1.1"  # fallback
 
-def record_chunk_sdk():
-    """Record 1-second chunk using Cooper's SDK pattern."""
-    samples = []
-    robot.media.start_recording()
-    start = time.time()
-    while time.time() - start < CHUNK_DURATION:
-        s = robot.media.get_audio_sample()
-        if s is not None and len(s) > 0:
-            samples.append(s)
-        time.sleep(0.05)  # Cooper's 50ms sleep
-    robot.media.stop_recording()
-
-    if not samples:
-        return None, 0.0
-
-    # Cooper's pattern: concatenate samples
-    audio = np.concatenate(samples)
-    mono = audio[:, 0] if len(audio.shape) > 1 else audio
+def record_chunk_sdk(cursor=None):
+    """Record a 1-second chunk from the mic ring buffer.
+
+    Reads the chunk following cursor (or the next fresh chunk if None) and
+    returns (pcm, rms_level, next_cursor). pcm is a mono int16 array at
+    SAMPLE_RATE in this thread's reused buffer, valid until the next call;
+    copy it out and wrap it with wav_header() before sending.
+    """
+    start_mic_reader()
+    if cursor is None:
+        cursor = _mic_ring.written
+    f32, i16 = _chunk_scratch()
+    mono, cursor = _mic_ring.read_next(cursor, CHUNK_SAMPLES, timeout=CHUNK_DURATION * 2, out=f32)
+
+    if mono is None:
+        return None, 0.0, cursor
     
-    # Check raw signal level for noise gate
-    peak_level = float(np.max(np.abs(mono)))
+    # RMS signal level for the noise gate (one dot product, no temporaries)
+    rms_level = float(np.sqrt(np.dot(mono, mono) / mono.size))
     
-    # Convert to wav bytes
-    buf = io.BytesIO()
-    with wave.open(buf, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(16000)
-        wf.writeframes((mono * 32767).astype(np.int16).tobytes())
-    buf.seek(0)
+    # Scale to int16 in place within this thread's preallocated buffers
+    np.multiply(mono, np.float32(32767.0), out=mono)
+    np.rint(mono, out=mono)
+    np.copyto(i16, mono, casting='unsafe')
     
-    return buf.read(), peak_level
+    return i16, rms_level, cursor
 
-def send_audio_to_macos(wav_chunks):
-    """Send accumulated speech chunks to macOS server."""
-    if not macos_host or not wav_chunks:
+class WavUpload:
+    """Request body streaming one WAV header followed by PCM chunks.
+
+    Having a length makes requests send a Content-Length and iterate the
+    parts onto the socket, without joining them or using chunked encoding
+    (the macOS server reads exactly Content-Length bytes).
+    """
+
+    def __init__(self, pcm_chunks, ulaw=False):
+        self.pcm_chunks = pcm_chunks
+        self.pcm_size = sum(len(c) for c in pcm_chunks)
+        self.ulaw = ulaw
+
+    def __len__(self):
+        return 44 + self.pcm_size
+
+    def __iter__(self):
+        # All chunks share one format, so a single header covers the utterance
+        yield wav_header(self.pcm_size, self.ulaw)
+        yield from self.pcm_chunks
+
+def send_audio_to_macos(pcm_chunks):
+    """Send accumulated speech PCM chunks to macOS server as one WAV."""
+    if not macos_host or not pcm_chunks:
         return
     
-    # Concatenate chunks - simple approach for now
-    # In production, you'd properly merge WAV headers
-    all_frames = b''
-    for wav_bytes in wav_chunks:
-        # Extract frames from each WAV (skip header)
-        if len(wav_bytes) > 44:  # Standard WAV header is 44 bytes
-            all_frames += wav_bytes[44:]
-    
-    # Create combined WAV
-    buf = io.BytesIO()
-    with wave.open(buf, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(16000)
-        wf.writeframes(all_frames)
-    buf.seek(0)
-    combined_wav = buf.read()
+    ulaw = upload_compression == "ulaw"
+    if ulaw:
+        # Half the bytes on the Wi-Fi link; Whisper decodes mu-law WAV natively
+        pcm_chunks = [ulaw_encode(np.frombuffer(c, dtype=np.int16)) for c in pcm_chunks]
+    body = WavUpload(pcm_chunks, ulaw)
     
     try:
         url = f"http://{macos_host}:{macos_port}/audio"
-        print(f"🚀 Pushing {len(wav_chunks)} chunks ({len(combined_wav)} bytes) to {url}", flush=True)
+        seconds = body.pcm_size / (SAMPLE_RATE * (1 if ulaw else 2))
+        print(f"🚀 Pushing {seconds:.1f}s ({len(body)} bytes) to {url}", flush=True)
         
-        response = requests.post(
+        response = _http.post(
             url,
-            data=combined_wav,
+            data=body,
             headers={'Content-Type': 'audio/wav'},
             timeout=5
         )
@@ -229,52 +405,118 @@ def send_audio_to_macos(wav_chunks):
     except Exception as e:
         print(f"❌ Failed to send to macOS: {e}", flush=True)
 
+# Finished utterances waiting to be pushed to macOS (bounded for backpressure)
+_upload_q = queue.Queue(maxsize=4)
+_uploader_thread = None
+
+# Preallocated utterance buffers leased by the listener and returned by the
+# uploader: one filling, up to a full queue waiting, one uploading
+UTTERANCE_BYTES = SAMPLE_RATE * 2 * MAX_UTTERANCE_SECONDS
+_frame_pool = queue.LifoQueue()
+for _ in range(_upload_q.maxsize + 2):
+    _frame_pool.put(bytearray(UTTERANCE_BYTES))
+
+# Utterances are gated per 1s chunk, so their edge chunks can be mostly
+# silence; trim them on 20ms frames, keeping a little padding
+TRIM_FRAME_SAMPLES = 320
+TRIM_PAD_FRAMES = 10
+
+def speech_bounds(pcm):
+    """Byte range of int16 ``pcm`` from the first to the last non-silent frame."""
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    n = samples.size // TRIM_FRAME_SAMPLES
+    if n == 0:
+        return 0, len(pcm)
+    frames = samples[:n * TRIM_FRAME_SAMPLES].reshape(n, TRIM_FRAME_SAMPLES).astype(np.float32)
+    energy = np.einsum('ij,ij->i', frames, frames) / TRIM_FRAME_SAMPLES
+    # Same level the gate closes at, read at call time so CLI overrides apply
+    loud = np.flatnonzero(energy > (GATE_CLOSE_RMS * 32767) ** 2)
+    if loud.size == 0:
+        return 0, len(pcm)
+    first = max(int(loud[0]) - TRIM_PAD_FRAMES, 0)
+    last = int(loud[-1]) + 1 + TRIM_PAD_FRAMES
+    end = len(pcm) if last >= n else last * TRIM_FRAME_SAMPLES * 2
+    return first * TRIM_FRAME_SAMPLES * 2, end
+
+def _uploader():
+    """Background thread: push queued utterances to macOS one at a time."""
+    while True:
+        frame, size = _upload_q.get()
+        try:
+            start, end = speech_bounds(memoryview(frame)[:size])
+            send_audio_to_macos([memoryview(frame)[start:end]])
+        finally:
+            _frame_pool.put(frame)
+            _upload_q.task_done()
+
+def _queue_utterance(frame, size):
+    """Hand a filled utterance buffer to the uploader; return the buffer to fill next."""
+    try:
+        _upload_q.put_nowait((frame, size))
+    except queue.Full:
+        print("⚠️ Upload queue full, dropping utterance", flush=True)
+        return frame
+    return _frame_pool.get()
+
+def start_uploader():
+    """Start the background uploader if it is not running."""
+    global _uploader_thread
+    if _uploader_thread and _uploader_thread.is_alive():
+        return
+    _uploader_thread = threading.Thread(target=_uploader, daemon=True)
+    _uploader_thread.start()
+
 def continuous_listener():
     """Cooper's continuous listening loop - runs in background thread."""
     global listening_active
     
-    print(f"🎤 Starting continuous listener (threshold: {NOISE_THRESHOLD})...", flush=True)
+    print(f"🎤 Starting continuous listener (gate: open>{GATE_OPEN_RMS} close<{GATE_CLOSE_RMS} RMS)...", flush=True)
     
-    accumulated_chunks = []
+    frame = _frame_pool.get()
+    filled = 0
     silence_counter = 0
+    gate_open = False
+    cursor = None  # Continue from the previous chunk so no samples are skipped
     
     while listening_active:
         try:
             # Record one chunk using Cooper's pattern
-            wav_chunk, peak_level = record_chunk_sdk()
-            if wav_chunk is None:
+            pcm_chunk, rms_level, cursor = record_chunk_sdk(cursor)
+            if pcm_chunk is None:
                 time.sleep(0.1)
                 continue
             
-            # Cooper's noise gate
-            is_speech = peak_level > NOISE_THRESHOLD
+            # Hysteretic noise gate: levels between the thresholds keep the
+            # current state, so brief dips and transients don't flip it
+            if rms_level > GATE_OPEN_RMS:
+                gate_open = True
+            elif rms_level < GATE_CLOSE_RMS:
+                gate_open = False
             
-            if is_speech:
+            if gate_open:
                 # Speech detected - accumulate
-                print(f"🎤 Speech: peak={peak_level:.4f}", flush=True)
-                accumulated_chunks.append(wav_chunk)
+                print(f"🎤 Speech: rms={rms_level:.4f}", flush=True)
+                if filled + pcm_chunk.nbytes > len(frame):
+                    # Buffer full - push what we have and keep going
+                    frame, filled = _queue_utterance(frame, filled), 0
+                frame[filled:filled + pcm_chunk.nbytes] = memoryview(pcm_chunk).cast('B')
+                filled += pcm_chunk.nbytes
                 silence_counter = 0
             else:
                 # Silence detected
-                print(f"🔇 Silence: peak={peak_level:.4f}", flush=True)
-                if accumulated_chunks:  # We have speech waiting
+                print(f"🔇 Silence: rms={rms_level:.4f}", flush=True)
+                if filled:  # We have speech waiting
                     silence_counter += 1
                     if silence_counter >= SILENCE_CHUNKS_TO_TRIGGER:
-                        # End of speech - send to macOS
-                        threading.Thread(
-                            target=send_audio_to_macos,
-                            args=(accumulated_chunks.copy(),),
-                            daemon=True
-                        ).start()
-                        
-                        # Reset for next speech
-                        accumulated_chunks.clear()
+                        # End of speech - hand off to the uploader
+                        frame, filled = _queue_utterance(frame, filled), 0
                         silence_counter = 0
                         
         except Exception as e:
             print(f"❌ Listener error: {e}", flush=True)
             time.sleep(1)  # Brief pause on error
     
+    _frame_pool.put(frame)
     print("🛑 Continuous listener stopped", flush=True)
 
 def start_listening():
@@ -289,6 +531,7 @@ def start_listening():
         print("🎤 Listener already running", flush=True)
         return True
     
+    start_uploader()
     listening_active = True
     listening_thread = threading.Thread(target=continuous_listener, daemon=True)
     listening_thread.start()
@@ -301,6 +544,21 @@ def stop_listening():
     listening_active = False
     print("🛑 Stopping background listening...", flush=True)
 
+# float32 scale so playback normalization never goes through float64
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# Requests are handled concurrently, but only one clip plays at a time
+_playback_lock = threading.Lock()
+
+STREAM_SAMPLE_RATE = 24000  # Default for /play_stream (OpenAI TTS pcm output)
+
+def _mono_to_stereo(pcm):
+    """Normalize mono int16 samples straight into a float32 stereo buffer."""
+    audio = np.empty((pcm.shape[0], 2), dtype=np.float32)
+    np.multiply(pcm, INT16_SCALE, out=audio[:, 0])
+    audio[:, 1] = audio[:, 0]
+    return audio
+
 def play_wav_data(wav_bytes):
     """Play wav audio using Cooper's SDK pattern."""
     buf = io.BytesIO(wav_bytes)
@@ -309,26 +567,79 @@ def play_wav_data(wav_bytes):
         nframes = wf.getnframes()
         sr = wf.getframerate()
         nc = wf.getnchannels()
-        # Cooper's playback pattern
-        audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-        if nc == 2:
-            audio = audio.reshape(-1, 2)  # Reshape to (num_samples, 2) for stereo
-        elif nc == 1:
-            audio = np.column_stack([audio, audio])  # Convert mono to stereo
-
-    robot.media.start_playing()
-    robot.media.push_audio_sample(audio)
-    time.sleep(nframes / sr + 0.5)  # Use actual frame count for timing
-    robot.media.stop_playing()
+        # Cooper's playback pattern, normalized in one float32 pass
+        pcm = np.frombuffer(frames, dtype=np.int16)
+        if nc == 1:
+            audio = _mono_to_stereo(pcm)
+        else:
+            audio = np.multiply(pcm, INT16_SCALE, dtype=np.float32)
+            if nc == 2:
+                audio = audio.reshape(-1, 2)  # Reshape to (num_samples, 2) for stereo
+
+    with _playback_lock:
+        robot.media.start_playing()
+        robot.media.push_audio_sample(audio)
+        time.sleep(nframes / sr + 0.5)  # Use actual frame count for timing
+        robot.media.stop_playing()
+
+def play_pcm_stream(blocks, sr):
+    """Play mono s16le PCM blocks as they arrive. Returns the number of bytes played."""
+    carry = b''
+    pushed = 0
+    with _playback_lock:
+        robot.media.start_playing()
+        try:
+            start = time.monotonic()
+            for block in blocks:
+                if carry:
+                    block = carry + block
+                usable = len(block) & ~1  # Blocks may split a sample
+                carry = block[usable:]
+                if not usable:
+                    continue
+                pcm = np.frombuffer(block, dtype=np.int16, count=usable // 2)
+                if not pushed:
+                    start = time.monotonic()
+                robot.media.push_audio_sample(_mono_to_stereo(pcm))
+                pushed += pcm.shape[0]
+            # Wait out whatever is still queued in the player
+            time.sleep(max(0.0, start + pushed / sr + 0.5 - time.monotonic()))
+        finally:
+            robot.media.stop_playing()
+    return pushed * 2
 
 def reachy_api(method, endpoint, data=None):
     """Call Reachy daemon API."""
     url = f"{REACHY_API}{endpoint}"
     try:
         if method == "GET":
-            r = requests.get(url, timeout=5)
+            r = _http.get(url, timeout=5)
         else:
-            r = requests.post(url, json=data, timeout=10)
+            r = _http.post(url, json=data, timeout=10)
+        return r.json() if r.text else {}
+    except Exception as e:
+        return {"error": str(e)}
+
+# /status daemon lookups are shared by callers within this window
+STATUS_CACHE_TTL = 0.5
+_daemon_status = {"value": None, "timestamp": 0.0}
+_daemon_status_lock = threading.Lock()
+
+def get_daemon_status():
+    """Return the daemon status, refreshed at most once per STATUS_CACHE_TTL."""
+    # Holding the lock through the call makes concurrent pollers share one request
+    with _daemon_status_lock:
+        now = time.monotonic()
+        if _daemon_status["value"] is None or now - _daemon_status["timestamp"] > STATUS_CACHE_TTL:
+            _daemon_status["value"] = reachy_api("GET", "/api/daemon/status")
+            _daemon_status["timestamp"] = now
+        return _daemon_status["value"]
+
+def reachy_api_raw(endpoint, body):
+    """POST a pre-encoded JSON body to the Reachy daemon API."""
+    url = f"{REACHY_API}{endpoint}"
+    try:
+        r = _http.post(url, data=body, headers={'Content-Type': 'application/json'}, timeout=10)
         return r.json() if r.text else {}
     except Exception as e:
         return {"error": str(e)}
@@ -339,29 +650,23 @@ def play_custom_animation(name):
     if name not in CUSTOM_ANIMATIONS:
         return {"error": f"Unknown animation: {name}", "available": list(CUSTOM_ANIMATIONS.keys())}
 
-    steps = CUSTOM_ANIMATIONS[name]
+    steps = CUSTOM_ANIMATIONS_COMPILED[name]
     print(f"Playing custom animation: {name} ({len(steps)} steps)", flush=True)
 
-    for step in steps:
-        # Build goto payload
-        head_pose = {
-            "x": 0,
-            "y": 0,
-            "z": step.get("head_z", 0),
-            "roll": step.get("head_roll", 0),
-            "pitch": step.get("head_pitch", 0),
-            "yaw": step.get("head_yaw", 0),
-        }
-        payload = {
-            "head_pose": head_pose,
-            "antennas_position": step.get("antennas", [0.4, 0.4]),
-            "duration": step.get("duration", 0.5),
-        }
+    # The daemon has no batch goto, so pipeline: each step is sent on its
+    # own schedule without waiting for the previous response
+    start = time.monotonic()
+    offset = 0.0
+    pending = []
+    for body, sleep_time in steps:
+        delay = start + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        pending.append(_goto_pool.submit(reachy_api_raw, "/api/move/goto", body))
+        offset += sleep_time
 
-        reachy_api("POST", "/api/move/goto", payload)
-        sleep_time = step.get("sleep", 0)
-        if sleep_time > 0:
-            time.sleep(sleep_time)
+    for future in pending:
+        future.result()
 
     return {"status": "ok", "animation": name, "steps": len(steps)}
 
@@ -371,6 +676,14 @@ _latest_frame_lock = threading.Lock()
 _camera_thread = None
 _camera_active = False
 CAMERA_SOCKET = "/tmp/reachymini_camera_socket"
+JPEG_QUALITY = 85
+
+def encode_jpeg(frame):
+    """Encode a BGR frame to JPEG bytes, via libjpeg-turbo when available."""
+    if TURBOJPEG_AVAILABLE:
+        return _turbojpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR)
+    _, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return encoded.tobytes()
 
 def _capture_frame_fallback():
     """Return the latest cached frame from the background camera thread, or None."""
@@ -398,9 +711,9 @@ def _camera_grabber():
                 if robot is not None:
                     frame = robot.media.get_frame()
                     if frame is not None:
-                        _, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                        jpeg_bytes = encode_jpeg(frame)
                         with _latest_frame_lock:
-                            _latest_frame["jpeg"] = encoded.tobytes()
+                            _latest_frame["jpeg"] = jpeg_bytes
                             _latest_frame["timestamp"] = time.time()
             except Exception as e:
                 print(f"📷 SDK frame error: {e}", flush=True)
@@ -442,9 +755,9 @@ def _camera_grabber():
                         data = buf.extract_dup(0, buf.get_size())
                         # Convert raw BGR to numpy array
                         frame = np.frombuffer(data, dtype=np.uint8).reshape((480, 640, 3))
-                        _, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                        jpeg_bytes = encode_jpeg(frame)
                         with _latest_frame_lock:
-                            _latest_frame["jpeg"] = encoded.tobytes()
+                            _latest_frame["jpeg"] = jpeg_bytes
                             _latest_frame["timestamp"] = time.time()
             except Exception as e:
                 print(f"📷 GStreamer frame error: {e}", flush=True)
@@ -490,7 +803,21 @@ def start_camera_grabber():
     _camera_thread.start()
 
 
+class BridgeServer(ThreadingHTTPServer):
+    """Thread-per-request server so playback doesn't stall other endpoints."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+
 class BridgeHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the voice loop's pooled session reuses its connection
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Small JSON replies shouldn't wait on Nagle's algorithm
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
     def log_message(self, format, *args):
         print(f"[{time.strftime('%H:%M:%S')}] {args[0]}", flush=True)
 
@@ -498,188 +825,270 @@ class BridgeHandler(BaseHTTPRequestHandler):
         self.send_response(code)
         if isinstance(body, bytes):
             self.send_header('Content-Type', 'audio/wav')
-            self.send_header('Content-Length', str(len(body)))
         else:
             self.send_header('Content-Type', 'application/json')
+            body = json.dumps(body).encode()
+        self.send_header('Content-Length', str(len(body)))
+        if code >= 400:
+            # The request body may be unread; don't reuse the connection
+            self.close_connection = True
+            self.send_header('Connection', 'close')
         self.end_headers()
-        if isinstance(body, bytes):
-            self.wfile.write(body)
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _iter_body(self, block=8192):
+        """Yield the request body as it arrives (Content-Length or chunked)."""
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size = int(self.rfile.readline().split(b';', 1)[0], 16)
+                if size == 0:
+                    # Skip any trailers up to the blank line
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                yield self.rfile.read(size)
+                self.rfile.readline()  # CRLF after each chunk
         else:
-            self.wfile.write(json.dumps(body).encode())
+            remaining = int(self.headers.get('Content-Length', 0))
+            while remaining > 0:
+                data = self.rfile.read(min(block, remaining))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+
+    def _dispatch(self, routes, prefixes):
+        """Look up the handler for this request: exact path first, then prefixes."""
+        path = urlsplit(self.path).path
+        handler = routes.get(path)
+        if handler is not None:
+            return handler(self)
+        for prefix, handler in prefixes:
+            if path.startswith(prefix):
+                return handler(self, path[len(prefix):])
+        self._respond(404, {"error": "not found"})
 
     def do_GET(self):
-        if self.path == '/status':
-            daemon = reachy_api("GET", "/api/daemon/status")
-            self._respond(200, {
-                "bridge": "Cooper's SDK Architecture",
-                "port": BRIDGE_PORT,
-                "sdk": "ReachyMini" if robot else "not connected",
-                "daemon": daemon,
-                "continuous_listening": listening_active,
-                "macos_host": macos_host,
-                "macos_port": macos_port,
-                "noise_threshold": NOISE_THRESHOLD,
-                "chunk_duration": CHUNK_DURATION
-            })
-
-        elif self.path == '/snapshot':
-            # Camera snapshot endpoint — tries SDK first, then ffmpeg fallback
-            try:
-                if robot is None:
-                    self._respond(503, {"error": "Robot not connected"})
-                    return
+        self._dispatch(self.GET_ROUTES, self.GET_PREFIXES)
+
+    def do_POST(self):
+        self._dispatch(self.POST_ROUTES, self.POST_PREFIXES)
+
+    # --- GET handlers ---
+
+    def _get_status(self):
+        daemon = get_daemon_status()
+        self._respond(200, {
+            "bridge": "Cooper's SDK Architecture",
+            "port": BRIDGE_PORT,
+            "sdk": "ReachyMini" if robot else "not connected",
+            "daemon": daemon,
+            "continuous_listening": listening_active,
+            "macos_host": macos_host,
+            "macos_port": macos_port,
+            "upload_compression": upload_compression,
+            "gate_open_rms": GATE_OPEN_RMS,
+            "gate_close_rms": GATE_CLOSE_RMS,
+            "chunk_duration": CHUNK_DURATION
+        })
 
-                # Try SDK first
-                frame = robot.media.get_frame()
-                
-                # Fallback: use libcamera-still via subprocess
-                # This requires the daemon to not hold the camera, so we
-                # use ffmpeg with v4l2 as a second attempt
-                if frame is None:
-                    jpeg_bytes = _capture_frame_fallback()
-                    if jpeg_bytes:
-                        self.send_response(200)
-                        self.send_header('Content-Type', 'image/jpeg')
-                        self.send_header('Content-Length', str(len(jpeg_bytes)))
-                        self.end_headers()
-                        self.wfile.write(jpeg_bytes)
-                        return
-                    self._respond(503, {"error": "No frame available (SDK and fallback both failed)"})
+    def _get_snapshot(self):
+        # Camera snapshot endpoint — tries SDK first, then ffmpeg fallback
+        try:
+            if robot is None:
+                self._respond(503, {"error": "Robot not connected"})
+                return
+
+            # Try SDK first
+            frame = robot.media.get_frame()
+            
+            # Fallback: use libcamera-still via subprocess
+            # This requires the daemon to not hold the camera, so we
+            # use ffmpeg with v4l2 as a second attempt
+            if frame is None:
+                jpeg_bytes = _capture_frame_fallback()
+                if jpeg_bytes:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'image/jpeg')
+                    self.send_header('Content-Length', str(len(jpeg_bytes)))
+                    self.end_headers()
+                    self.wfile.write(jpeg_bytes)
                     return
+                self._respond(503, {"error": "No frame available (SDK and fallback both failed)"})
+                return
+
+            # Encode SDK frame as JPEG
+            jpeg_bytes = encode_jpeg(frame)
 
-                # Encode SDK frame as JPEG
-                _, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                jpeg_bytes = encoded.tobytes()
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(jpeg_bytes)))
+            self.end_headers()
+            self.wfile.write(jpeg_bytes)
 
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
+
+    def _get_listen(self):
+        # Legacy compatibility for manual recording
+        try:
+            params = parse_qs(urlsplit(self.path).query, max_num_fields=4)
+            duration = min(float(params.get('duration', ['5'])[0]), MAX_LISTEN_SECONDS)
+        except ValueError as e:
+            self._respond(400, {"error": f"invalid query: {e}"})
+            return
+        try:
+            # Use multiple chunks for longer recordings
+            chunks = int(duration / CHUNK_DURATION) or 1
+            pcm, rms, _ = record_chunk_sdk()
+            print(f"🎤 Manual recording: {duration}s, rms={rms:.4f}", flush=True)
+            if pcm is not None:
+                wav_data = wav_header(pcm.nbytes) + pcm.tobytes()
                 self.send_response(200)
-                self.send_header('Content-Type', 'image/jpeg')
-                self.send_header('Content-Length', str(len(jpeg_bytes)))
+                self.send_header('Content-Type', 'audio/wav')
+                self.send_header('Content-Length', str(len(wav_data)))
+                self.send_header('X-Raw-RMS', f"{rms:.6f}")
                 self.end_headers()
-                self.wfile.write(jpeg_bytes)
+                self.wfile.write(wav_data)
+            else:
+                self._respond(500, {"error": "recording failed"})
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
 
-            except Exception as e:
-                self._respond(500, {"error": str(e)})
-
-        elif self.path.startswith('/listen'):
-            # Legacy compatibility for manual recording
-            duration = 5
-            if '?' in self.path:
-                params = dict(p.split('=') for p in self.path.split('?')[1].split('&') if '=' in p)
-                duration = float(params.get('duration', 5))
-            try:
-                # Use multiple chunks for longer recordings
-                chunks = int(duration / CHUNK_DURATION) or 1
-                wav_data, peak = record_chunk_sdk()
-                print(f"🎤 Manual recording: {duration}s, peak={peak:.4f}", flush=True)
-                if wav_data:
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'audio/wav')
-                    self.send_header('Content-Length', str(len(wav_data)))
-                    self.send_header('X-Raw-Peak', f"{peak:.6f}")
-                    self.end_headers()
-                    self.wfile.write(wav_data)
-                else:
-                    self._respond(500, {"error": "recording failed"})
-            except Exception as e:
-                self._respond(500, {"error": str(e)})
+    # --- POST handlers ---
 
-        else:
-            self._respond(404, {"error": "not found"})
+    def _post_play(self):
+        # Cooper's playback endpoint
+        try:
+            wav_data = self._read_body()
+            print(f"🔊 Playing {len(wav_data)} bytes...", flush=True)
+            play_wav_data(wav_data)
+            self._respond(200, {"status": "ok", "played_bytes": len(wav_data)})
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
 
-    def do_POST(self):
-        content_length = int(self.headers.get('Content-Length', 0))
+    def _post_play_stream(self):
+        # Raw PCM playback that starts before the upload finishes
+        try:
+            params = parse_qs(urlsplit(self.path).query, max_num_fields=4)
+            rate = int(params.get('rate', [str(STREAM_SAMPLE_RATE)])[0])
+        except ValueError as e:
+            self._respond(400, {"error": f"invalid query: {e}"})
+            return
+        try:
+            print(f"🔊 Streaming PCM at {rate} Hz...", flush=True)
+            played = play_pcm_stream(self._iter_body(), rate)
+            self._respond(200, {"status": "ok", "played_bytes": played})
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
 
-        if self.path == '/play':
-            # Cooper's playback endpoint
-            try:
-                wav_data = self.rfile.read(content_length)
-                print(f"🔊 Playing {len(wav_data)} bytes...", flush=True)
-                play_wav_data(wav_data)
-                self._respond(200, {"status": "ok", "played_bytes": len(wav_data)})
-            except Exception as e:
-                self._respond(500, {"error": str(e)})
+    def _post_play_base64(self):
+        try:
+            body = json.loads(self._read_body())
+            wav_data = base64.b64decode(body['audio'])
+            print(f"🔊 Playing {len(wav_data)} bytes (b64)...", flush=True)
+            play_wav_data(wav_data)
+            self._respond(200, {"status": "ok"})
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
 
-        elif self.path == '/play/base64':
-            try:
-                body = json.loads(self.rfile.read(content_length))
-                wav_data = base64.b64decode(body['audio'])
-                print(f"🔊 Playing {len(wav_data)} bytes (b64)...", flush=True)
-                play_wav_data(wav_data)
-                self._respond(200, {"status": "ok"})
-            except Exception as e:
-                self._respond(500, {"error": str(e)})
+    def _post_configure(self):
+        # Set macOS endpoint and start listening
+        try:
+            global macos_host, macos_port, upload_compression
+            body = json.loads(self._read_body())
+            compression = body.get('compression', upload_compression)
+            if compression not in (None, "ulaw"):
+                self._respond(400, {"error": f"unsupported compression: {compression}"})
+                return
+            macos_host = body.get('host', macos_host)
+            macos_port = body.get('port', macos_port)
+            upload_compression = compression
+            
+            print(f"🎯 Configured macOS endpoint: {macos_host}:{macos_port}", flush=True)
+            
+            # Auto-start listening
+            if start_listening():
+                self._respond(200, {
+                    "status": "configured", 
+                    "host": macos_host, 
+                    "port": macos_port,
+                    "compression": upload_compression,
+                    "listening": True
+                })
+            else:
+                self._respond(500, {"error": "failed to start listening"})
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
 
-        elif self.path == '/configure':
-            # Set macOS endpoint and start listening
-            try:
-                global macos_host, macos_port
-                body = json.loads(self.rfile.read(content_length))
-                macos_host = body.get('host', macos_host)
-                macos_port = body.get('port', macos_port)
-                
-                print(f"🎯 Configured macOS endpoint: {macos_host}:{macos_port}", flush=True)
-                
-                # Auto-start listening
-                if start_listening():
-                    self._respond(200, {
-                        "status": "configured", 
-                        "host": macos_host, 
-                        "port": macos_port,
-                        "listening": True
-                    })
-                else:
-                    self._respond(500, {"error": "failed to start listening"})
-            except Exception as e:
-                self._respond(500, {"error": str(e)})
+    def _post_animate(self, anim_name):
+        # Custom animations (look, nod, wiggle, think, surprise, etc.)
+        result = play_custom_animation(anim_name)
+        self._respond(200, result)
 
-        elif self.path.startswith('/animate/'):
-            # Custom animations (look, nod, wiggle, think, surprise, etc.)
-            anim_name = self.path.split('/animate/')[-1]
-            result = play_custom_animation(anim_name)
-            self._respond(200, result)
+    def _post_animations(self):
+        # List available custom animations
+        self._respond(200, {"animations": list(CUSTOM_ANIMATIONS.keys())})
 
-        elif self.path == '/animations':
-            # List available custom animations
-            self._respond(200, {"animations": list(CUSTOM_ANIMATIONS.keys())})
+    def _post_emotion(self, emotion):
+        result = reachy_api("POST",
+            f"/api/move/play/recorded-move-dataset/pollen-robotics/reachy-mini-emotions-library/{emotion}")
+        self._respond(200, result)
 
-        elif self.path.startswith('/emotion/'):
-            emotion = self.path.split('/emotion/')[-1]
-            result = reachy_api("POST",
-                f"/api/move/play/recorded-move-dataset/pollen-robotics/reachy-mini-emotions-library/{emotion}")
-            self._respond(200, result)
+    def _post_dance(self, dance):
+        result = reachy_api("POST",
+            f"/api/move/play/recorded-move-dataset/pollen-robotics/reachy-mini-dances-library/{dance}")
+        self._respond(200, result)
 
-        elif self.path.startswith('/dance/'):
-            dance = self.path.split('/dance/')[-1]
-            result = reachy_api("POST",
-                f"/api/move/play/recorded-move-dataset/pollen-robotics/reachy-mini-dances-library/{dance}")
-            self._respond(200, result)
+    def _post_wake(self):
+        result = reachy_api("POST", "/api/move/play/wake_up")
+        self._respond(200, result)
 
-        elif self.path == '/wake':
-            result = reachy_api("POST", "/api/move/play/wake_up")
-            self._respond(200, result)
+    def _post_sleep(self):
+        result = reachy_api("POST", "/api/move/play/goto_sleep")
+        self._respond(200, result)
 
-        elif self.path == '/sleep':
-            result = reachy_api("POST", "/api/move/play/goto_sleep")
-            self._respond(200, result)
+    def _post_stop(self):
+        result = reachy_api("POST", "/api/move/stop")
+        self._respond(200, result)
 
-        elif self.path == '/stop':
-            result = reachy_api("POST", "/api/move/stop")
+    def _post_goto(self):
+        try:
+            body = json.loads(self._read_body())
+            result = reachy_api("POST", "/api/move/goto", body)
             self._respond(200, result)
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
 
-        elif self.path == '/goto':
-            try:
-                body = json.loads(self.rfile.read(content_length))
-                result = reachy_api("POST", "/api/move/goto", body)
-                self._respond(200, result)
-            except Exception as e:
-                self._respond(500, {"error": str(e)})
-
-        else:
-            self._respond(404, {"error": "not found"})
+    GET_ROUTES = {
+        '/status': _get_status,
+        '/snapshot': _get_snapshot,
+        '/listen': _get_listen,
+    }
+    GET_PREFIXES = ()
+    POST_ROUTES = {
+        '/play': _post_play,
+        '/play/base64': _post_play_base64,
+        '/play_stream': _post_play_stream,
+        '/configure': _post_configure,
+        '/animations': _post_animations,
+        '/wake': _post_wake,
+        '/sleep': _post_sleep,
+        '/stop': _post_stop,
+        '/goto': _post_goto,
+    }
+    POST_PREFIXES = (
+        ('/animate/', _post_animate),
+        ('/emotion/', _post_emotion),
+        ('/dance/', _post_dance),
+    )
 
 def main():
     """Main entry point."""
-    global macos_host, macos_port
+    global macos_host, macos_port, GATE_OPEN_RMS, GATE_CLOSE_RMS
     
     parser = argparse.ArgumentParser(description="Reachy Bridge - Cooper's SDK Architecture")
     parser.add_argument('--macos-host', default=os.environ.get('MACOS_HOST'),
@@ -688,7 +1097,19 @@ def main():
                        help='macOS voice server port (default: 8888)')
     parser.add_argument('--no-listen', action='store_true',
                        help='Disable continuous listening (use polling mode only)')
+    parser.add_argument('--gate-open-rms', type=float, default=GATE_OPEN_RMS,
+                       help=f'Chunk RMS that opens the noise gate (default: {GATE_OPEN_RMS} or env GATE_OPEN_RMS)')
+    parser.add_argument('--gate-close-rms', type=float, default=None,
+                       help='Chunk RMS below which the gate closes (default: half of --gate-open-rms or env GATE_CLOSE_RMS)')
     args = parser.parse_args()
+
+    GATE_OPEN_RMS = args.gate_open_rms
+    if args.gate_close_rms is not None:
+        GATE_CLOSE_RMS = args.gate_close_rms
+    elif 'GATE_CLOSE_RMS' not in os.environ:
+        GATE_CLOSE_RMS = GATE_OPEN_RMS / 2
+    if GATE_CLOSE_RMS > GATE_OPEN_RMS:
+        parser.error('--gate-close-rms must not exceed --gate-open-rms')
     
     # Initialize SDK
     init_robot()
@@ -704,7 +1125,7 @@ def main():
     
     print(f"🌉 Starting Reachy Bridge on port {BRIDGE_PORT}")
     print(f"🎯 Will push speech to: {macos_host}:{macos_port}")
-    print(f"🎚️  Noise threshold: {NOISE_THRESHOLD}")
+    print(f"🎚️  Noise gate: open>{GATE_OPEN_RMS} close<{GATE_CLOSE_RMS} RMS")
     print(f"⏱️  Chunk duration: {CHUNK_DURATION}s")
     print(f"🔇 Silence trigger: {SILENCE_CHUNKS_TO_TRIGGER} chunks")
     
@@ -718,7 +1139,7 @@ def main():
         print("🔇 Continuous listening disabled (polling mode only)", flush=True)
     
     try:
-        HTTPServer(('0.0.0.0', BRIDGE_PORT), BridgeHandler).serve_forever()
+        BridgeServer(('0.0.0.0', BRIDGE_PORT), BridgeHandler).serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...", flush=True)
         stop_listening()
@@ -7,7 +7,7 @@ Runs on macOS. HTTP server that receives speech from Reachy bridge, then:
   1. Transcribe with OpenAI Whisper API
   2. Send to AI via OpenClaw chat completions API
   3. Generate speech with OpenAI TTS
-  4. POST wav back to Reachy bridge /play
+  4. POST audio back to Reachy bridge (/play_stream as TTS streams in, or /play)
 
 Cooper's Push Architecture:
 - Reachy bridge continuously listens with noise gate
@@ -24,17 +24,67 @@ Environment Variables:
   OPENCLAW_TOKEN=...              # From OpenClaw config
   OPENAI_TTS_VOICE=shimmer        # nova, shimmer, alloy, fable
   REACHY_BRIDGE=http://192.168.1.171:9000
+  AGENT_NAME=Reachy               # Name used in the system prompt
+  WHISPER_MODEL=gpt-4o-mini-transcribe  # or gpt-4o-transcribe, whisper-1
+
+Canned phrases (greeting, goodbye, error replies) are synthesized once and
+kept in bridge/cache/ (PHRASE_CACHE_DIR); --prewarm fills it ahead of time.
+
+Optional response cache (--cache-db path.sqlite):
+  Repeated utterances ("hello", "who are you") reuse the previous AI reply
+  and its TTS wav instead of calling OpenClaw and TTS again.
 """
 
 import os
 import sys
 import json
 import time
+import sqlite3
+import io
+import re
+import wave
+import queue
+import hashlib
 import requests
-import tempfile
+from requests.adapters import HTTPAdapter
 import threading
+import atexit
+import socket
 import argparse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import functools
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
+# Log records are handed to a queue and written to stdout by a listener
+# thread, so pipeline threads never block on terminal or pipe writes
+logger = logging.getLogger("voice_loop")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%H:%M:%S'))
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 # Configuration
 REACHY_BRIDGE = os.environ.get("REACHY_BRIDGE", "http://192.168.1.171:9000")
@@ -42,119 +92,471 @@ OPENCLAW_API = os.environ.get("OPENCLAW_API", "http://localhost:18789")
 OPENCLAW_TOKEN = os.environ.get("OPENCLAW_TOKEN", "REDACTED_CLAWDBOT_TOKEN")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 OPENAI_TTS_VOICE = os.environ.get("OPENAI_TTS_VOICE", "shimmer")
+AGENT_NAME = os.environ.get("AGENT_NAME", "Reachy")
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "gpt-4o-mini-transcribe")
 
 # Server settings
 VOICE_SERVER_PORT = 8888
 
-def log(msg):
-    """Log with timestamp."""
-    print(f"[{time.strftime('%H:%M:%S')}] {msg}", flush=True)
+# One keep-alive session for OpenAI, OpenClaw and the bridge, so each call
+# reuses a pooled connection instead of a fresh TCP + TLS handshake
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0))
+_http.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0))
+
+# Streaming replies: the AI response is streamed and spoken sentence by
+# sentence; each sentence's TTS (OpenAI "pcm", 24kHz mono s16le) is forwarded
+# to the bridge's /play_stream as it downloads (disable with --no-stream-tts)
+STREAM_TTS = True
+TTS_PCM_RATE = 24000
+TTS_STREAM_CHUNK = 4096
+
+# Fixed phrases whose TTS is kept on disk as <name>_<voice>.wav, so startup,
+# shutdown and error replies never wait on (or pay for) a TTS call
+CANNED_PHRASES = {
+    "greeting": "Hey! I'm ready to listen.",
+    "goodbye": "Goodbye!",
+    "not_caught": "Sorry, I didn't catch that.",
+    "tech_issue": "Sorry, I had a technical issue.",
+}
+_PHRASE_NAMES = {text: name for name, text in CANNED_PHRASES.items()}
+PHRASE_CACHE_DIR = os.environ.get(
+    "PHRASE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+
+# Response cache (enabled with --cache-db)
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+_cache = None
+
+# Utterance pipeline: up to PIPELINE_WORKERS utterances are transcribed /
+# answered / synthesized at once, but replies are played in arrival order.
+PIPELINE_WORKERS = 3
+_pipeline = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="voice")
+_order = threading.Condition()
+_submitted = 0     # next sequence number to hand out
+_played = 0        # every seq below this has played (or been dropped)
+_finished = set()  # seqs done out of order, waiting for earlier ones
+
+def _cache_key(*parts):
+    """Hash normalized text (plus any qualifiers like the voice) into a cache key."""
+    norm = " ".join(parts[0].lower().split())
+    return hashlib.sha256("\0".join((norm,) + parts[1:]).encode()).hexdigest()
+
+class ResponseCache:
+    """SQLite cache of AI replies (keyed on transcript) and TTS wavs (keyed on reply + voice)."""
+
+    def __init__(self, path, ttl=CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses "
+                         "(key TEXT PRIMARY KEY, response TEXT, created REAL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS tts_cache "
+                         "(key TEXT PRIMARY KEY, wav BLOB, created REAL)")
+        self._db.commit()
+
+    def _get(self, table, column, key):
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {column}, created FROM {table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row and time.time() - row[1] < self.ttl:
+            return row[0]
+        return None
+
+    def _put(self, table, column, key, value):
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {table} (key, {column}, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._db.commit()
+
+    def get_response(self, text):
+        return self._get("responses", "response", _cache_key(text))
+
+    def put_response(self, text, response):
+        self._put("responses", "response", _cache_key(text), response)
+
+    def get_speech(self, text, voice):
+        wav = self._get("tts_cache", "wav", _cache_key(text, voice))
+        return bytes(wav) if wav is not None else None
+
+    def put_speech(self, text, voice, wav_bytes):
+        self._put("tts_cache", "wav", _cache_key(text, voice), sqlite3.Binary(wav_bytes))
 
 def transcribe_audio(wav_bytes):
-    """Transcribe audio using OpenAI Whisper API."""
+    """Transcribe audio using the OpenAI transcription API (WHISPER_MODEL)."""
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(wav_bytes)
-            f.flush()
-            
-            with open(f.name, "rb") as audio_file:
-                resp = requests.post(
-                    "https://api.openai.com/v1/audio/transcriptions",
-                    headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-                    files={"file": ("audio.wav", audio_file, "audio/wav")},
-                    data={"model": "whisper-1", "language": "en"},
-                    timeout=15,
-                )
-            
-            os.unlink(f.name)  # Clean up temp file
+        # Upload straight from memory; no temp file round-trip
+        resp = _http.post(
+            "https://api.openai.com/v1/audio/transcriptions",
+            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+            files={"file": ("audio.wav", wav_bytes, "audio/wav")},
+            data={"model": WHISPER_MODEL, "language": "en"},
+            timeout=15,
+        )
+        
+        if resp.ok:
+            result = _json_loads(resp.content).get("text", "").strip()
+            logger.info("👂 Transcribed: \"%s\"", result)
+            return result
+        else:
+            logger.error("❌ Whisper error: %s %s", resp.status_code, resp.text)
+            return ""
             
-            if resp.ok:
-                result = resp.json().get("text", "").strip()
-                log(f"👂 Transcribed: \"{result}\"")
-                return result
-            else:
-                log(f"❌ Whisper error: {resp.status_code} {resp.text}")
-                return ""
-                
     except Exception as e:
-        log(f"❌ Transcription failed: {e}")
+        logger.error("❌ Transcription failed: %s", e)
         return ""
 
+# Built once so every request starts with a byte-identical prefix that the
+# provider's prompt cache can match
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": (
+        f"You are {AGENT_NAME} speaking through a Reachy Mini robot. "
+        "Keep responses SHORT — 1-2 sentences max. "
+        "Be natural, conversational, warm. "
+        "You're physically present in the room talking to someone. "
+        "Don't use emojis or markdown — this will be spoken aloud."
+    ),
+}
+
+# Known Whisper outputs for silence/noise, plus bare fillers; compared after
+# lowercasing and stripping punctuation
+_TRIVIAL_TRANSCRIPTS = {
+    "", "you", "thank you", "thanks for watching", "thank you for watching",
+    "bye", "ok", "okay", "uh", "um", "hmm", "mm", "ah", "oh",
+}
+_NON_WORD = re.compile(r"[^\w\s']+")
+
+def is_trivial_transcript(text):
+    """True for transcripts not worth an AI call (noise, fillers, hallucinations)."""
+    norm = " ".join(_NON_WORD.sub(" ", text.lower()).split())
+    return len(norm) < 2 or norm in _TRIVIAL_TRANSCRIPTS
+
+def _chat_body(text, stream=False):
+    """Chat completions request body for one utterance."""
+    body = {
+        "model": "default",
+        "messages": [_SYSTEM_MSG, {"role": "user", "content": text}],
+        "max_tokens": 150,
+    }
+    if stream:
+        body["stream"] = True
+    return body
+
 def get_ai_response(text):
     """Get response via OpenClaw chat completions."""
+    if _cache:
+        cached = _cache.get_response(text)
+        if cached is not None:
+            logger.info("💬 AI Response (cached): \"%s\"", cached)
+            return cached
     try:
-        resp = requests.post(
+        resp = _http.post(
             f"{OPENCLAW_API}/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {OPENCLAW_TOKEN}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": "default",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": (
-                            f"You are {os.environ.get('AGENT_NAME', 'Reachy')} speaking through a Reachy Mini robot. "
-                            "Keep responses SHORT — 1-2 sentences max. "
-                            "Be natural, conversational, warm. "
-                            "You're physically present in the room talking to someone. "
-                            "Don't use emojis or markdown — this will be spoken aloud."
-                        ),
-                    },
-                    {"role": "user", "content": text},
-                ],
-                "max_tokens": 150,
-            },
+            data=_json_dumps(_chat_body(text)),
             timeout=30,
         )
         
         if resp.ok:
-            data = resp.json()
+            data = _json_loads(resp.content)
             response = data["choices"][0]["message"]["content"].strip()
-            log(f"💬 AI Response: \"{response}\"")
+            logger.info("💬 AI Response: \"%s\"", response)
+            if _cache and response:
+                _cache.put_response(text, response)
             return response
         else:
-            log(f"❌ OpenClaw error: {resp.status_code} {resp.text}")
-            return "Sorry, I didn't catch that."
+            logger.error("❌ OpenClaw error: %s %s", resp.status_code, resp.text)
+            return CANNED_PHRASES["not_caught"]
             
     except Exception as e:
-        log(f"❌ AI response failed: {e}")
-        return "Sorry, I had a technical issue."
+        logger.error("❌ AI response failed: %s", e)
+        return CANNED_PHRASES["tech_issue"]
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_sentences(buf):
+    """Split complete sentences off ``buf``; returns (sentences, unfinished tail)."""
+    parts = _SENTENCE_END.split(buf)
+    return [p.strip() for p in parts[:-1] if p.strip()], parts[-1]
+
+def stream_ai_sentences(text):
+    """Yield the AI response a sentence at a time as OpenClaw streams it (SSE)."""
+    if _cache:
+        cached = _cache.get_response(text)
+        if cached is not None:
+            logger.info("💬 AI Response (cached): \"%s\"", cached)
+            sentences, tail = split_sentences(cached)
+            yield from sentences + ([tail.strip()] if tail.strip() else [])
+            return
+    spoken = []
+    try:
+        resp = _http.post(
+            f"{OPENCLAW_API}/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENCLAW_TOKEN}",
+                "Content-Type": "application/json",
+            },
+            data=_json_dumps(_chat_body(text, stream=True)),
+            timeout=30,
+            stream=True,
+        )
+        
+        if not resp.ok:
+            logger.error("❌ OpenClaw error: %s %s", resp.status_code, resp.text)
+            yield CANNED_PHRASES["not_caught"]
+            return
+        
+        buf = ""
+        with resp:
+            for line in resp.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = _json_loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if not delta:
+                    continue
+                buf += delta
+                sentences, buf = split_sentences(buf)
+                for sentence in sentences:
+                    spoken.append(sentence)
+                    yield sentence
+        if buf.strip():
+            spoken.append(buf.strip())
+            yield buf.strip()
+        
+        response = " ".join(spoken)
+        logger.info("💬 AI Response: \"%s\"", response)
+        if _cache and response:
+            _cache.put_response(text, response)
+            
+    except Exception as e:
+        logger.error("❌ AI response failed: %s", e)
+        if not spoken:
+            yield CANNED_PHRASES["tech_issue"]
+
+def _phrase_path(text):
+    """Disk path for a canned phrase's wav in the current voice, else None."""
+    name = _PHRASE_NAMES.get(text)
+    if name is None:
+        return None
+    return os.path.join(PHRASE_CACHE_DIR, f"{name}_{OPENAI_TTS_VOICE}.wav")
+
+def cached_speech(text):
+    """Previously synthesized wav for ``text`` (canned phrase or response cache), else None."""
+    path = _phrase_path(text)
+    if path:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+    if _cache:
+        return _cache.get_speech(text, OPENAI_TTS_VOICE)
+    return None
+
+def store_speech(text, wav_bytes):
+    """Remember synthesized speech: canned phrases on disk, the rest in the response cache."""
+    path = _phrase_path(text)
+    if path:
+        os.makedirs(PHRASE_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(wav_bytes)
+        os.replace(tmp, path)
+    elif _cache:
+        _cache.put_speech(text, OPENAI_TTS_VOICE, wav_bytes)
+
+def prewarm_phrases():
+    """Synthesize any canned phrase missing from the phrase cache."""
+    for text in CANNED_PHRASES.values():
+        if not os.path.exists(_phrase_path(text)):
+            generate_speech(text)
 
 def generate_speech(text):
     """Convert text to speech using OpenAI TTS."""
+    cached = cached_speech(text)
+    if cached is not None:
+        logger.info("🔊 TTS (cached, %s bytes)", len(cached))
+        return cached
     try:
-        resp = requests.post(
+        resp = _http.post(
             "https://api.openai.com/v1/audio/speech",
             headers={
                 "Authorization": f"Bearer {OPENAI_API_KEY}",
                 "Content-Type": "application/json",
             },
-            json={
+            data=_json_dumps({
                 "model": "tts-1",
                 "input": text,
                 "voice": OPENAI_TTS_VOICE,
                 "response_format": "wav",
-            },
+            }),
             timeout=15,
         )
         
         if resp.ok:
-            log(f"🔊 Generated TTS ({len(resp.content)} bytes)")
+            logger.info("🔊 Generated TTS (%s bytes)", len(resp.content))
+            store_speech(text, resp.content)
             return resp.content
         else:
-            log(f"❌ TTS error: {resp.status_code} {resp.text}")
+            logger.error("❌ TTS error: %s %s", resp.status_code, resp.text)
             return None
             
     except Exception as e:
-        log(f"❌ TTS failed: {e}")
+        logger.error("❌ TTS failed: %s", e)
+        return None
+
+def pcm_to_wav(pcm_bytes, rate=TTS_PCM_RATE):
+    """Wrap mono s16le PCM in a wav container."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm_bytes)
+    return buf.getvalue()
+
+def open_speech_stream(text):
+    """Start a streaming TTS request for raw PCM; returns the open response or None."""
+    try:
+        resp = _http.post(
+            "https://api.openai.com/v1/audio/speech",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            data=_json_dumps({
+                "model": "tts-1",
+                "input": text,
+                "voice": OPENAI_TTS_VOICE,
+                "response_format": "pcm",
+            }),
+            timeout=15,
+            stream=True,
+        )
+        
+        if resp.ok:
+            return resp
+        logger.error("❌ TTS error: %s %s", resp.status_code, resp.text)
+        resp.close()
+        return None
+            
+    except Exception as e:
+        logger.error("❌ TTS failed: %s", e)
         return None
 
+def _wav_pcm(wav_bytes):
+    """PCM frames of a cached wav, if it matches the streaming format."""
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) != (1, 2, TTS_PCM_RATE):
+            return None
+        return wf.readframes(wf.getnframes())
+
+class SpeechStream:
+    """AI reply spoken sentence by sentence.
+
+    A background thread streams the reply and opens each sentence's TTS
+    request as soon as the sentence is complete; ``chunks()`` yields the
+    PCM in order, so later sentences download while earlier ones play.
+    """
+
+    def __init__(self, text):
+        self._sentences = queue.Queue()
+        self._drained = False
+        threading.Thread(target=self._produce, args=(text,), daemon=True).start()
+
+    def _produce(self, text):
+        try:
+            for i, sentence in enumerate(stream_ai_sentences(text)):
+                if i == 0:
+                    trigger_emotion("welcoming1")
+                self._sentences.put((sentence, self._open(sentence)))
+        finally:
+            self._sentences.put(None)
+
+    def _open(self, sentence):
+        wav = cached_speech(sentence)
+        pcm = _wav_pcm(wav) if wav else None
+        if pcm:
+            return pcm
+        return open_speech_stream(sentence)
+
+    def chunks(self):
+        """Yield PCM for every sentence, in order, as it arrives."""
+        while True:
+            item = self._sentences.get()
+            if item is None:
+                self._drained = True
+                return
+            sentence, source = item
+            if source is None:
+                continue
+            if isinstance(source, bytes):
+                yield source
+                continue
+            pcm = []
+            with source:
+                for chunk in source.iter_content(TTS_STREAM_CHUNK):
+                    pcm.append(chunk)
+                    yield chunk
+            if _cache or _phrase_path(sentence):
+                store_speech(sentence, pcm_to_wav(b"".join(pcm)))
+
+    def close(self):
+        """Release TTS responses that were never played."""
+        while not self._drained:
+            item = self._sentences.get()
+            if item is None:
+                self._drained = True
+                return
+            if item[1] is not None and not isinstance(item[1], bytes):
+                item[1].close()
+
+def stream_to_reachy(speech):
+    """Forward a SpeechStream to the Reachy bridge while it downloads."""
+    played = 0
+    
+    def _chunks():
+        nonlocal played
+        for chunk in speech.chunks():
+            played += len(chunk)
+            yield chunk
+    
+    try:
+        # A generator body goes out with chunked transfer encoding
+        resp = _http.post(
+            f"{REACHY_BRIDGE}/play_stream?rate={TTS_PCM_RATE}",
+            data=_chunks(),
+            headers={"Content-Type": "audio/L16"},
+            timeout=30,
+        )
+        
+        if resp.ok:
+            logger.info("✅ Streamed to Reachy (%s bytes)", played)
+            return True
+        else:
+            logger.error("❌ Reachy playback error: %s", resp.status_code)
+            return False
+            
+    except Exception as e:
+        logger.error("❌ Failed to stream to Reachy: %s", e)
+        return False
+    finally:
+        speech.close()
+
 def send_to_reachy(wav_bytes):
     """Send audio to Reachy bridge for playback."""
     try:
-        resp = requests.post(
+        resp = _http.post(
             f"{REACHY_BRIDGE}/play",
             data=wav_bytes,
             headers={"Content-Type": "audio/wav"},
@@ -162,209 +564,309 @@ def send_to_reachy(wav_bytes):
         )
         
         if resp.ok:
-            log(f"✅ Sent to Reachy ({len(wav_bytes)} bytes)")
+            logger.info("✅ Sent to Reachy (%s bytes)", len(wav_bytes))
             return True
         else:
-            log(f"❌ Reachy playback error: {resp.status_code}")
+            logger.error("❌ Reachy playback error: %s", resp.status_code)
             return False
             
     except Exception as e:
-        log(f"❌ Failed to send to Reachy: {e}")
+        logger.error("❌ Failed to send to Reachy: %s", e)
         return False
 
-def trigger_emotion(emotion):
-    """Trigger emotion animation on Reachy (non-blocking)."""
-    def _trigger():
+_emotion_q = queue.Queue()
+_emotion_lock = threading.Lock()
+_emotion_thread = None
+_last_emotion = None
+
+def _emotion_worker():
+    """Post queued emotions to the bridge, skipping stale and repeated ones."""
+    global _last_emotion
+    while True:
+        emotion = _emotion_q.get()
+        # Only the newest pending emotion is worth playing
         try:
-            requests.post(f"{REACHY_BRIDGE}/emotion/{emotion}", timeout=5)
-        except:
+            while True:
+                emotion = _emotion_q.get_nowait()
+        except queue.Empty:
+            pass
+        if emotion == _last_emotion:
+            continue
+        _last_emotion = emotion
+        try:
+            _http.post(f"{REACHY_BRIDGE}/emotion/{emotion}", timeout=5)
+        except Exception:
             pass  # Non-critical
-    threading.Thread(target=_trigger, daemon=True).start()
 
-def process_audio(wav_bytes):
-    """Process received audio through the full pipeline."""
-    log(f"🎤 Processing audio ({len(wav_bytes)} bytes)")
-    
-    # Show thinking animation
-    trigger_emotion("thoughtful1")
-    
-    # 1. Transcribe
-    text = transcribe_audio(wav_bytes)
-    if not text or len(text.strip()) < 2:
-        log("🔇 No meaningful text transcribed")
+def trigger_emotion(emotion):
+    """Trigger emotion animation on Reachy (non-blocking)."""
+    global _emotion_thread
+    with _emotion_lock:
+        if _emotion_thread is None:
+            _emotion_thread = threading.Thread(target=_emotion_worker, daemon=True)
+            _emotion_thread.start()
+    _emotion_q.put(emotion)
+
+def _wait_turn(seq):
+    """Block until every utterance submitted before ``seq`` has played."""
+    with _order:
+        _order.wait_for(lambda: _played == seq)
+
+def _finish_turn(seq):
+    """Mark ``seq`` done and let the next utterance in line play."""
+    global _played
+    with _order:
+        _finished.add(seq)
+        while _played in _finished:
+            _finished.remove(_played)
+            _played += 1
+        _order.notify_all()
+
+def submit_audio(wav_bytes):
+    """Queue an utterance on the pipeline, tagged with its arrival order."""
+    global _submitted
+    with _order:
+        seq = _submitted
+        _submitted += 1
+    _pipeline.submit(process_audio, wav_bytes, seq)
+
+def process_audio(wav_bytes, seq=None):
+    """Process received audio through the full pipeline.
+
+    Steps 1-3 overlap with other utterances in flight; with a ``seq`` the
+    send to Reachy waits until earlier utterances have played.
+    """
+    logger.info("🎤 Processing audio (%s bytes)", len(wav_bytes))
+    try:
+        # Show thinking animation
+        trigger_emotion("thoughtful1")
+        
+        # 1. Transcribe
+        text = transcribe_audio(wav_bytes)
+        if not text or is_trivial_transcript(text):
+            logger.info("🔇 No meaningful text transcribed")
+            trigger_emotion("attentive1")
+            return
+        
+        # 2-3. AI response and speech (streamed sentence by sentence)
+        if STREAM_TTS:
+            speech = SpeechStream(text)
+        else:
+            response = get_ai_response(text)
+            trigger_emotion("welcoming1")
+            speech_bytes = generate_speech(response)
+            if not speech_bytes:
+                return
+        
+        # 4. Send to Reachy (in arrival order)
+        if seq is not None:
+            _wait_turn(seq)
+        if STREAM_TTS:
+            stream_to_reachy(speech)
+        else:
+            send_to_reachy(speech_bytes)
+        
+        # 5. Back to listening pose
         trigger_emotion("attentive1")
-        return
-    
-    # 2. Get AI response
-    response = get_ai_response(text)
-    
-    # 3. Generate speech
-    trigger_emotion("welcoming1")
-    speech_bytes = generate_speech(response)
-    if not speech_bytes:
-        return
-    
-    # 4. Send to Reachy
-    send_to_reachy(speech_bytes)
-    
-    # 5. Back to listening pose
-    trigger_emotion("attentive1")
-    log("")  # Blank line for readability
+        logger.info("")  # Blank line for readability
+    except Exception:
+        # Runs on the pipeline executor, which would otherwise keep the
+        # exception in a discarded Future
+        logger.exception("❌ Pipeline error")
+    finally:
+        if seq is not None:
+            _finish_turn(seq)
+
+_RECEIVED_BODY = _json_dumps({"status": "received"})
+
+class VoiceServer(ThreadingHTTPServer):
+    # One thread per connection, so a slow upload never blocks the accept loop
+    daemon_threads = True
+    allow_reuse_address = True
 
 class VoiceServerHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the bridge's pooled session reuses its connection
+    protocol_version = "HTTP/1.1"
+
     def log_message(self, format, *args):
         # Suppress default request logging
         pass
     
+    def _respond(self, code, body=b""):
+        self.send_response(code)
+        if body:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if code >= 400:
+            # The request body may be unread; don't reuse the connection
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_POST(self):
         if self.path == '/audio':
             # Receive audio from Reachy bridge
             content_length = int(self.headers.get('Content-Length', 0))
             if content_length == 0:
-                self.send_response(400)
-                self.end_headers()
+                self._respond(400)
                 return
             
             wav_bytes = self.rfile.read(content_length)
             
-            # Process in background thread to return quickly
-            threading.Thread(
-                target=process_audio, 
-                args=(wav_bytes,), 
-                daemon=True
-            ).start()
+            # Process on the pipeline to return quickly
+            submit_audio(wav_bytes)
             
             # Quick response to bridge
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "received"}).encode())
+            self._respond(200, _RECEIVED_BODY)
             
         else:
-            self.send_response(404)
-            self.end_headers()
+            self._respond(404)
     
     def do_GET(self):
         if self.path == '/status':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
             status = {
                 "service": "Voice Loop - Cooper's Push Architecture",
                 "reachy_bridge": REACHY_BRIDGE,
                 "openai_configured": bool(OPENAI_API_KEY),
                 "tts_voice": OPENAI_TTS_VOICE,
-                "openclaw_api": OPENCLAW_API
+                "tts_stream": STREAM_TTS,
+                "openclaw_api": OPENCLAW_API,
+                "cache": _cache is not None
             }
-            self.wfile.write(json.dumps(status, indent=2).encode())
+            self._respond(200, json.dumps(status, indent=2).encode())
         else:
-            self.send_response(404)
-            self.end_headers()
+            self._respond(404)
+
+@functools.lru_cache(maxsize=8)
+def get_local_ip(target_host):
+    """Local address of the interface that routes to ``target_host``.
+
+    A UDP connect only consults the routing table; nothing is sent.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect((target_host, 80))
+            return s.getsockname()[0]
+    except OSError:
+        return socket.gethostbyname(socket.gethostname())
 
 def configure_bridge(bridge_url, voice_server_port):
     """Configure the Reachy bridge to push audio to this server."""
     try:
         # Get local IP for bridge to reach us
-        import socket
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
+        local_ip = get_local_ip(urlsplit(bridge_url).hostname or "8.8.8.8")
         
         config = {
             "host": local_ip,
             "port": voice_server_port
         }
         
-        log(f"🎯 Configuring bridge to push to {local_ip}:{voice_server_port}")
+        logger.info("🎯 Configuring bridge to push to %s:%s", local_ip, voice_server_port)
         
-        resp = requests.post(
+        resp = _http.post(
             f"{bridge_url}/configure",
             json=config,
             timeout=10
         )
         
         if resp.ok:
-            log("✅ Bridge configured successfully")
+            logger.info("✅ Bridge configured successfully")
             return True
         else:
-            log(f"❌ Bridge configuration failed: {resp.status_code}")
+            logger.error("❌ Bridge configuration failed: %s", resp.status_code)
             return False
             
     except Exception as e:
-        log(f"❌ Failed to configure bridge: {e}")
+        logger.error("❌ Failed to configure bridge: %s", e)
         return False
 
 def main():
     """Main entry point."""
+    global REACHY_BRIDGE, STREAM_TTS, _cache
+
     parser = argparse.ArgumentParser(description="Voice Loop - Cooper's Push Architecture")
     parser.add_argument('--port', type=int, default=VOICE_SERVER_PORT,
                        help=f'Voice server port (default: {VOICE_SERVER_PORT})')
     parser.add_argument('--reachy-bridge', default=REACHY_BRIDGE,
                        help=f'Reachy bridge URL (default: {REACHY_BRIDGE})')
+    parser.add_argument('--cache-db', default=None,
+                       help='SQLite file for caching AI replies and TTS audio (default: disabled)')
+    parser.add_argument('--prewarm', action='store_true',
+                       help='Synthesize missing canned phrases into the phrase cache and exit')
+    parser.add_argument('--no-stream-tts', action='store_true',
+                       help='Download the full TTS wav before sending it to /play')
     args = parser.parse_args()
     
     # Check requirements
     if not OPENAI_API_KEY:
-        log("❌ Set OPENAI_API_KEY environment variable")
+        logger.error("❌ Set OPENAI_API_KEY environment variable")
         sys.exit(1)
     
-    global REACHY_BRIDGE
     REACHY_BRIDGE = args.reachy_bridge
+    STREAM_TTS = not args.no_stream_tts
+    if args.cache_db:
+        _cache = ResponseCache(args.cache_db)
+    
+    if args.prewarm:
+        logger.info("🔥 Pre-synthesizing canned phrases into %s", PHRASE_CACHE_DIR)
+        prewarm_phrases()
+        return
     
-    log("🤖 Voice Loop starting...")
-    log(f"   Bridge: {REACHY_BRIDGE}")
-    log(f"   OpenClaw: {OPENCLAW_API}")
-    log(f"   TTS Voice: {OPENAI_TTS_VOICE}")
-    log(f"   Server Port: {args.port}")
+    logger.info("🤖 Voice Loop starting...")
+    logger.info("   Bridge: %s", REACHY_BRIDGE)
+    logger.info("   OpenClaw: %s", OPENCLAW_API)
+    logger.info("   TTS Voice: %s", OPENAI_TTS_VOICE)
+    logger.info("   Transcription: %s", WHISPER_MODEL)
+    logger.info("   Server Port: %s", args.port)
+    logger.info("   Cache: %s", args.cache_db or 'disabled')
     
     # Test bridge connection
     try:
-        resp = requests.get(f"{REACHY_BRIDGE}/status", timeout=5)
+        resp = _http.get(f"{REACHY_BRIDGE}/status", timeout=5)
         if resp.ok:
-            log("✅ Bridge reachable")
+            logger.info("✅ Bridge reachable")
         else:
-            log("⚠️  Bridge responded with error")
+            logger.warning("⚠️  Bridge responded with error")
     except Exception as e:
-        log(f"❌ Cannot reach bridge: {e}")
-        log("   Make sure reachy_bridge.py is running on Reachy")
+        logger.error("❌ Cannot reach bridge: %s", e)
+        logger.info("   Make sure reachy_bridge.py is running on Reachy")
         sys.exit(1)
     
     # Configure bridge to push to this server
     if not configure_bridge(REACHY_BRIDGE, args.port):
-        log("❌ Failed to configure bridge")
+        logger.error("❌ Failed to configure bridge")
         sys.exit(1)
     
     # Start HTTP server
     try:
-        server = HTTPServer(('0.0.0.0', args.port), VoiceServerHandler)
+        server = VoiceServer(('0.0.0.0', args.port), VoiceServerHandler)
         
         # Send startup greeting to Reachy
-        log("📢 Sending startup greeting...")
-        greeting_audio = generate_speech("Hey! I'm ready to listen.")
+        logger.info("📢 Sending startup greeting...")
+        greeting_audio = generate_speech(CANNED_PHRASES["greeting"])
         if greeting_audio:
             send_to_reachy(greeting_audio)
         trigger_emotion("cheerful1")
         
-        log("")
-        log("🎤 Voice Loop ready! Waiting for speech from Reachy...")
-        log("   (Ctrl+C to stop)")
-        log("")
+        logger.info("")
+        logger.info("🎤 Voice Loop ready! Waiting for speech from Reachy...")
+        logger.info("   (Ctrl+C to stop)")
+        logger.info("")
         
         server.serve_forever()
         
     except KeyboardInterrupt:
-        log("")
-        log("👋 Stopping voice loop...")
+        logger.info("")
+        logger.info("👋 Stopping voice loop...")
         
         # Send goodbye
-        goodbye_audio = generate_speech("Goodbye!")
+        goodbye_audio = generate_speech(CANNED_PHRASES["goodbye"])
         if goodbye_audio:
             send_to_reachy(goodbye_audio)
         trigger_emotion("goodbye1")
         time.sleep(2)
         
-        log("🛑 Voice loop stopped")
+        logger.info("🛑 Voice loop stopped")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
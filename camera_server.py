@@ -2,7 +2,8 @@
 """Simple HTTP camera server for Reachy Mini.
 
 Serves camera snapshots via HTTP without requiring the SDK.
-Uses rpicam-still for Raspberry Pi camera capture.
+Keeps a picamera2 pipeline running when picamera2 is installed, otherwise
+falls back to one rpicam-still process per snapshot.
 Run this on the robot alongside talk_wireless.py.
 
 Usage:
@@ -10,27 +11,58 @@ Usage:
 """
 
 import asyncio
+import io
 import logging
 import subprocess
-import tempfile
-import os
 from aiohttp import web
 
+try:
+    from picamera2 import Picamera2
+    PICAMERA2_AVAILABLE = True
+except ImportError:
+    PICAMERA2_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 PORT = 9001
+JPEG_QUALITY = 85
+# Same low-light settings as the rpicam-still flags below
+PICAMERA2_CONTROLS = {
+    "ExposureValue": 2.0,
+    "AnalogueGain": 16.0,
+    "ExposureTime": 100000,
+    "AwbEnable": True,
+}
 
 
 class CameraServer:
-    """Simple HTTP server that serves camera snapshots using rpicam-still."""
+    """Simple HTTP server that serves camera snapshots (picamera2 or rpicam-still)."""
 
     def __init__(self):
         self._lock = asyncio.Lock()
         self._available = False
+        self._picam = None
+
+    def _start_picamera2(self):
+        """Open the camera and keep it streaming so captures skip sensor start-up."""
+        picam = Picamera2()
+        picam.configure(picam.create_still_configuration(
+            main={"size": (640, 480)}, controls=PICAMERA2_CONTROLS))
+        picam.options["quality"] = JPEG_QUALITY
+        picam.start()
+        return picam
 
     async def start(self):
-        """Check if rpicam-still is available."""
+        """Start picamera2 if possible, else check that rpicam-still is available."""
+        if PICAMERA2_AVAILABLE:
+            try:
+                self._picam = await asyncio.to_thread(self._start_picamera2)
+                self._available = True
+                logger.info("Camera available (picamera2)")
+                return True
+            except Exception as e:
+                logger.warning(f"picamera2 start failed, using rpicam-still: {e}")
         try:
             result = subprocess.run(['which', 'rpicam-still'], capture_output=True)
             self._available = result.returncode == 0
@@ -44,20 +76,33 @@ class CameraServer:
             return False
 
     async def stop(self):
-        """Nothing to release."""
-        pass
+        """Release the picamera2 pipeline, if any."""
+        if self._picam is not None:
+            await asyncio.to_thread(self._picam.close)
+            self._picam = None
+
+    def _capture_picamera2(self) -> bytes:
+        buf = io.BytesIO()
+        self._picam.capture_file(buf, format='jpeg')
+        return buf.getvalue()
 
     async def capture_jpeg(self) -> bytes | None:
-        """Capture a frame using rpicam-still."""
+        """Capture a frame from the running pipeline, or with rpicam-still."""
         if not self._available:
             return None
 
-        async with self._lock:
+        if self._picam is not None:
+            # picamera2 queues concurrent captures itself; no lock needed
             try:
-                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as f:
-                    temp_path = f.name
+                return await asyncio.to_thread(self._capture_picamera2) or None
+            except Exception as e:
+                logger.warning(f"Camera capture error: {e}")
+                return None
 
-                # Capture with rpicam-still (optimized for low light)
+        async with self._lock:
+            try:
+                # Capture with rpicam-still (optimized for low light),
+                # reading the JPEG from stdout instead of a temp file
                 proc = await asyncio.create_subprocess_exec(
                     'rpicam-still',
                     '-n',  # No preview
@@ -68,19 +113,20 @@ class CameraServer:
                     '--gain', '16',  # High gain for low light
                     '--shutter', '100000',  # 100ms shutter (longer exposure)
                     '--awb', 'auto',  # Auto white balance
-                    '-q', '85',  # JPEG quality
-                    '-o', temp_path,
-                    stdout=asyncio.subprocess.DEVNULL,
+                    '-q', str(JPEG_QUALITY),  # JPEG quality
+                    '-o', '-',
+                    stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.DEVNULL,
                 )
-                await asyncio.wait_for(proc.wait(), timeout=5.0)
+                try:
+                    jpeg_data, _ = await asyncio.wait_for(proc.communicate(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
 
-                if os.path.exists(temp_path):
-                    with open(temp_path, 'rb') as f:
-                        jpeg_data = f.read()
-                    os.unlink(temp_path)
-                    if jpeg_data:
-                        return jpeg_data
+                if proc.returncode == 0 and jpeg_data:
+                    return jpeg_data
 
             except asyncio.TimeoutError:
                 logger.warning("Camera capture timed out")
@@ -101,6 +147,7 @@ class CameraServer:
         return web.json_response({
             "service": "camera_server",
             "camera_available": self._available,
+            "backend": "picamera2" if self._picam is not None else "rpicam-still",
             "port": PORT,
         })
 
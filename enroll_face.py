@@ -18,12 +18,16 @@ Requires:
 import argparse
 import logging
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 import httpx
 import numpy as np
 
+from face_registry import FaceRegistry
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -38,6 +42,10 @@ except ImportError:
     FACE_RECOGNITION_AVAILABLE = False
     logger.error("face_recognition not installed. Install with: pip install face_recognition")
 
+DETECT_MAX_SIDE = 480  # Longest side of the image face detection runs on
+
+_boost_buf: np.ndarray | None = None  # Output of the low-light boost, reused per frame size
+
 
 def get_robot_ip() -> str:
     """Get robot IP from config or default."""
@@ -55,18 +63,22 @@ def get_robot_ip() -> str:
     return os.environ.get("ROBOT_IP", "127.0.0.1")
 
 
+# One keep-alive client for every capture, so the connectivity check and
+# each enrollment sample reuse the same connection to camera_server.py
+_client = httpx.Client(timeout=5.0, limits=httpx.Limits(keepalive_expiry=60.0))
+
+
 def capture_frame(robot_ip: str, port: int = 9001) -> np.ndarray | None:
     """Capture a frame from the robot camera via HTTP."""
     url = f"http://{robot_ip}:{port}/snapshot"
     try:
-        with httpx.Client(timeout=5.0) as client:
-            response = client.get(url)
-            if response.status_code == 200:
-                img_array = np.frombuffer(response.content, dtype=np.uint8)
-                frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                return frame
-            else:
-                logger.error(f"Camera returned status {response.status_code}")
+        response = _client.get(url)
+        if response.status_code == 200:
+            img_array = np.frombuffer(response.content, dtype=np.uint8)
+            frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+            return frame
+        else:
+            logger.error(f"Camera returned status {response.status_code}")
     except httpx.ConnectError:
         logger.error(f"Cannot connect to camera at {url}")
         logger.error("Make sure camera_server.py is running on the robot")
@@ -75,42 +87,99 @@ def capture_frame(robot_ip: str, port: int = 9001) -> np.ndarray | None:
     return None
 
 
-def extract_embedding(frame: np.ndarray) -> np.ndarray | None:
-    """Extract face embedding from a frame.
+def warm_up_models() -> None:
+    """Run the landmark and recognition models once on a blank image.
+
+    dlib sets up its networks on first use; doing that while the user is
+    still reading the prompt keeps the first sample from paying for it.
+    """
+    blank = np.zeros((150, 150, 3), dtype=np.uint8)
+    face_recognition.face_encodings(blank, [(0, 150, 150, 0)])
+
+
+def find_face(frame: np.ndarray) -> tuple[np.ndarray, list[tuple[int, int, int, int]]] | None:
+    """Locate a face in a frame, returning the RGB image and its face box.
 
     Tries multiple preprocessing approaches to maximize detection success,
-    especially for low-light conditions.
+    especially for low-light conditions. Embedding is left to encode_faces
+    so all samples can be encoded in one batch.
     """
     if not FACE_RECOGNITION_AVAILABLE:
         return None
 
+    global _boost_buf
+
     # For low-light images, boost brightness significantly
     # This is the key to detecting faces in dark rooms
-    brightness = frame.mean()
+    # (every 8th pixel in each direction is plenty for a threshold)
+    brightness = frame[::8, ::8].mean()
     logger.debug(f"Frame brightness: {brightness:.1f}/255")
 
     if brightness < 100:
-        # Super boost for dark images
+        # Super boost for dark images, written into a reused buffer
         alpha = 3.0  # Strong contrast
         beta = 100   # Strong brightness
-        frame = cv2.convertScaleAbs(frame, alpha=alpha, beta=beta)
-        logger.debug(f"Boosted to: {frame.mean():.1f}/255")
+        if _boost_buf is None or _boost_buf.shape != frame.shape:
+            _boost_buf = np.empty(frame.shape, dtype=np.uint8)
+        frame = cv2.convertScaleAbs(frame, dst=_boost_buf, alpha=alpha, beta=beta)
+        logger.debug(f"Boosted to: {frame[::8, ::8].mean():.1f}/255")
 
     rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    encodings = face_recognition.face_encodings(rgb)
-    if encodings:
-        return encodings[0]
-
-    # Try with upsampling for smaller/distant faces
-    locations = face_recognition.face_locations(rgb, number_of_times_to_upsample=1)
+    locations = detect_faces(rgb)
     if locations:
-        encodings = face_recognition.face_encodings(rgb, locations)
-        if encodings:
-            return encodings[0]
+        return rgb, locations[:1]
 
     return None
 
 
+def encode_faces(samples: list[tuple[np.ndarray, list[tuple[int, int, int, int]]]]) -> list[np.ndarray]:
+    """Compute one embedding per (rgb, face box) sample in a single batch.
+
+    dlib's recognition network accepts a list of images, so enrollment pays
+    its per-call setup once instead of once per sample.
+    """
+    if not samples:
+        return []
+    try:
+        import dlib
+        from face_recognition.api import _raw_face_landmarks, face_encoder
+    except ImportError:
+        return [face_recognition.face_encodings(rgb, locations)[0] for rgb, locations in samples]
+
+    images, shapes = [], []
+    for rgb, locations in samples:
+        detections = dlib.full_object_detections()
+        # 5-point model, as face_encodings uses, so enrolled and live embeddings align alike
+        for landmarks in _raw_face_landmarks(rgb, locations, model="small"):
+            detections.append(landmarks)
+        images.append(rgb)
+        shapes.append(detections)
+    # Same jitter count face_recognition.face_encodings uses by default
+    descriptors = face_encoder.compute_face_descriptor(images, shapes, 1)
+    return [np.array(faces[0]) for faces in descriptors]
+
+
+def detect_faces(rgb: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """Find face boxes in full-resolution coordinates.
+
+    HOG detection cost grows with pixel count, so a first pass runs without
+    upsampling on a copy whose longest side is DETECT_MAX_SIDE, which finds
+    a face close enough to enroll. Only when that misses does it fall back to
+    the full frame with one upsample (the face_encodings default), so the
+    smallest detectable face is the same as detecting on the full frame.
+    """
+    scale = min(1.0, DETECT_MAX_SIDE / max(rgb.shape[:2]))
+    if scale < 1.0:
+        small = cv2.resize(rgb, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        locations = face_recognition.face_locations(small, number_of_times_to_upsample=0)
+        if locations:
+            return [
+                (int(top / scale), int(right / scale), int(bottom / scale), int(left / scale))
+                for top, right, bottom, left in locations
+            ]
+    return face_recognition.face_locations(rgb, number_of_times_to_upsample=1)
+
+
 def enroll_face(name: str, robot_ip: str, num_samples: int = 3) -> bool:
     """Enroll a face with the given name.
 
@@ -128,8 +197,6 @@ def enroll_face(name: str, robot_ip: str, num_samples: int = 3) -> bool:
         logger.error("face_recognition not available")
         return False
 
-    from face_registry import FaceRegistry
-
     registry = FaceRegistry.load()
 
     print(f"\n{'='*50}")
@@ -142,40 +209,49 @@ def enroll_face(name: str, robot_ip: str, num_samples: int = 3) -> bool:
     print("Move slightly between captures for better recognition.")
     print()
 
-    embeddings_captured = 0
-
-    for i in range(num_samples):
-        input(f"Press Enter to capture sample {i+1}/{num_samples}...")
-
-        # Capture frame
-        print("Capturing...", end=" ", flush=True)
-        frame = capture_frame(robot_ip)
-
-        if frame is None:
-            print("FAILED - no frame")
-            continue
-
-        # Extract embedding
-        embedding = extract_embedding(frame)
-
-        if embedding is None:
-            print("FAILED - no face detected")
+    warmup = threading.Thread(target=warm_up_models, daemon=True)
+    warmup.start()
+
+    # Face detection runs on one background worker, overlapping the next
+    # prompt and snapshot download; all samples are encoded in one batch
+    # at the end
+    detections = []
+    with ThreadPoolExecutor(max_workers=1) as detector:
+        for i in range(num_samples):
+            input(f"Press Enter to capture sample {i+1}/{num_samples}...")
+            warmup.join()  # Don't share the dlib models with the warm-up call
+
+            # Capture frame
+            print("Capturing...", end=" ", flush=True)
+            frame = capture_frame(robot_ip)
+
+            if frame is None:
+                print("FAILED - no frame")
+                continue
+
+            detections.append((i + 1, detector.submit(find_face, frame)))
+            print(f"OK - frame captured!")
+
+            # Small delay between captures
+            if i < num_samples - 1:
+                time.sleep(0.5)
+
+    samples = []
+    for number, detection in detections:
+        sample = detection.result()
+        if sample is None:
+            print(f"Sample {number}: no face detected")
             print("  Make sure your face is visible and well-lit")
             continue
+        samples.append(sample)
 
-        # Register this embedding
-        registry.register_user(name, embedding)
-        embeddings_captured += 1
-        print(f"OK - face captured!")
-
-        # Small delay between captures
-        if i < num_samples - 1:
-            time.sleep(0.5)
+    embeddings = encode_faces(samples)
+    registry.register_user_bulk(name, embeddings)
 
     print()
-    if embeddings_captured > 0:
-        print(f"Enrolled {name} with {embeddings_captured} sample(s)")
-        print(f"Registry saved to: ~/.reachy/face_registry.json")
+    if embeddings:
+        print(f"Enrolled {name} with {len(embeddings)} sample(s)")
+        print(f"Registry saved to: ~/.reachy/face_registry.npz")
         print()
         print("Now when you run talk_wireless.py, you'll be recognized as:")
         print(f"  User ID: {name}")
@@ -188,8 +264,6 @@ def enroll_face(name: str, robot_ip: str, num_samples: int = 3) -> bool:
 
 def list_users():
     """List all enrolled users."""
-    from face_registry import FaceRegistry
-
     registry = FaceRegistry.load()
     users = registry.list_users()
 
@@ -212,8 +286,6 @@ def list_users():
 
 def delete_user(name: str) -> bool:
     """Delete an enrolled user."""
-    from face_registry import FaceRegistry
-
     registry = FaceRegistry.load()
 
     if name not in registry.list_users():
@@ -1,10 +1,14 @@
 """Face identity registry for multi-user recognition.
 
-Stores face embeddings in ~/.reachy/face_registry.json for persistent user identification.
+Stores face embeddings in ~/.reachy/face_registry.npz (int8) for persistent user
+identification; a legacy face_registry.json is read once and migrated on the next save.
 """
 
+import atexit
 import json
 import logging
+import os
+import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -13,10 +17,34 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
-REGISTRY_PATH = Path("~/.reachy/face_registry.json").expanduser()
+REGISTRY_PATH_NPZ = Path("~/.reachy/face_registry.npz").expanduser()
+REGISTRY_PATH = Path("~/.reachy/face_registry.json").expanduser()  # Legacy, read for migration
 MATCH_THRESHOLD = 0.6  # L2 distance threshold (lower = stricter matching)
 MAX_EMBEDDINGS_PER_USER = 10  # Store multiple embeddings for robustness
+EMBEDDING_DIM = 128  # face_recognition (dlib) embedding size
+# Embeddings are stored unit-length, where L2 distance d and cosine
+# similarity s are related by s = 1 - d^2 / 2
+MATCH_SIMILARITY = 1.0 - MATCH_THRESHOLD**2 / 2
+# Tighter bar (90% of the L2 threshold) for accepting the last user without
+# scoring everyone else
+FAST_MATCH_SIMILARITY = 1.0 - (0.9 * MATCH_THRESHOLD) ** 2 / 2
 NEW_USER_CONSECUTIVE_MISSES = 3  # Require N misses before creating a new user
+SAVE_INTERVAL = 5.0  # Seconds between saves of embeddings accumulated by identify()
+
+
+def normalize(embedding: np.ndarray) -> np.ndarray:
+    """Scale embeddings (a vector or rows of a matrix) to unit L2 norm, as float32."""
+    embedding = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(embedding, axis=-1, keepdims=True)
+    unit: np.ndarray = embedding / np.maximum(norm, np.float32(1e-12))
+    return unit
+
+
+def quantize(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Quantize rows to int8, returning them with the per-row float32 scale to undo it."""
+    scales = np.abs(rows).max(axis=1, initial=0.0) / 127
+    safe = np.where(scales > 0, scales, 1.0)
+    return np.round(rows / safe[:, None]).astype(np.int8), scales.astype(np.float32)
 
 
 @dataclass
@@ -24,22 +52,26 @@ class RegisteredFace:
     """A registered face with user ID and embeddings."""
 
     user_id: str
-    embeddings: list[np.ndarray]
+    embeddings: np.ndarray  # (K, EMBEDDING_DIM) unit-norm float32, oldest first
+
+    def __post_init__(self) -> None:
+        """Store embeddings as a (K, EMBEDDING_DIM) unit-norm float32 matrix."""
+        self.embeddings = normalize(np.reshape(self.embeddings, (-1, EMBEDDING_DIM)))
 
     @property
     def embedding(self) -> np.ndarray:
         """Primary embedding (first stored)."""
-        return self.embeddings[0]
+        first: np.ndarray = self.embeddings[0]
+        return first
 
     def best_distance(self, embedding: np.ndarray) -> float:
         """Return the minimum L2 distance across all stored embeddings."""
-        return min(np.linalg.norm(embedding - e) for e in self.embeddings)
+        return float(np.linalg.norm(self.embeddings - normalize(embedding), axis=1).min())
 
     def add_embedding(self, embedding: np.ndarray) -> None:
         """Add an embedding, dropping the oldest if at capacity."""
-        if len(self.embeddings) >= MAX_EMBEDDINGS_PER_USER:
-            self.embeddings.pop(0)
-        self.embeddings.append(embedding)
+        keep = self.embeddings[max(len(self.embeddings) - MAX_EMBEDDINGS_PER_USER + 1, 0):]
+        self.embeddings = np.vstack((keep, normalize(embedding)[None]))
 
 
 @dataclass
@@ -50,44 +82,81 @@ class FaceRegistry:
     _last_identified_user: str | None = None
     _consecutive_misses: int = 0
     _last_miss_embedding: np.ndarray | None = None
+    # All users' embeddings stacked into one matrix, with the owning face's
+    # index per row and each face's first row; rebuilt lazily after any
+    # mutation that changes a face's row count
+    _gallery: np.ndarray | None = field(default=None, repr=False, compare=False)
+    _owners: np.ndarray | None = field(default=None, repr=False, compare=False)
+    _starts: np.ndarray | None = field(default=None, repr=False, compare=False)
+    _user_index: dict[str, int] = field(default_factory=dict, repr=False, compare=False)  # user_id -> face index
+    # Matched embeddings are only written every SAVE_INTERVAL seconds
+    _dirty: bool = field(default=False, repr=False, compare=False)
+    _last_save: float = field(default_factory=time.monotonic, repr=False, compare=False)
 
     @classmethod
     def load(cls) -> "FaceRegistry":
-        """Load from disk or create empty registry."""
+        """Load from disk (NPZ, else legacy JSON) or create empty registry."""
         registry = cls()
-        if REGISTRY_PATH.exists():
-            try:
-                data = json.loads(REGISTRY_PATH.read_text())
-                for entry in data.get("faces", []):
-                    # Support both old (single embedding) and new (list) format
-                    raw = entry.get("embeddings", None)
-                    if raw is None:
-                        raw = [entry["embedding"]]
-                    embeddings = [np.array(e) for e in raw]
-                    registry._faces.append(
-                        RegisteredFace(
-                            user_id=entry["user_id"],
-                            embeddings=embeddings,
-                        )
-                    )
-                logger.info(f"Loaded {len(registry._faces)} faces from registry")
-            except Exception as e:
-                logger.warning(f"Failed to load face registry: {e}")
+        atexit.register(registry.flush)
+        try:
+            if REGISTRY_PATH_NPZ.exists():
+                registry._load_npz()
+            elif REGISTRY_PATH.exists():
+                registry._load_json()
+            else:
+                return registry
+            logger.info(f"Loaded {len(registry._faces)} faces from registry")
+        except Exception as e:
+            logger.warning(f"Failed to load face registry: {e}")
         return registry
 
+    def _load_npz(self) -> None:
+        with np.load(REGISTRY_PATH_NPZ, allow_pickle=False) as data:
+            gallery = data["gallery"].astype(np.float32)
+            if "scales" in data:
+                # int8 rows, each with its own dequantization scale
+                gallery *= data["scales"][:, None]
+            user_ids = data["user_ids"].tolist()
+            counts = data["counts"]
+        for user_id, rows in zip(user_ids, np.split(gallery, np.cumsum(counts)[:-1])):
+            self._faces.append(RegisteredFace(user_id, rows))
+
+    def _load_json(self) -> None:
+        data = json.loads(REGISTRY_PATH.read_text())
+        for entry in data.get("faces", []):
+            # Support both old (single embedding) and new (list) format
+            raw = entry.get("embeddings", None)
+            if raw is None:
+                raw = [entry["embedding"]]
+            embeddings = np.asarray(raw, dtype=np.float32)
+            self._faces.append(
+                RegisteredFace(
+                    user_id=entry["user_id"],
+                    embeddings=embeddings,
+                )
+            )
+
     def save(self) -> None:
-        """Save registry to disk."""
-        REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "faces": [
-                {
-                    "user_id": f.user_id,
-                    "embeddings": [e.tolist() for e in f.embeddings],
-                }
-                for f in self._faces
-            ]
-        }
-        REGISTRY_PATH.write_text(json.dumps(data, indent=2))
+        """Save registry to disk as an int8-quantized NPZ, replaced atomically."""
+        REGISTRY_PATH_NPZ.parent.mkdir(parents=True, exist_ok=True)
+        gallery, scales = quantize(self._build_gallery()[0])
+        tmp = REGISTRY_PATH_NPZ.with_name(REGISTRY_PATH_NPZ.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                gallery=gallery,
+                scales=scales,
+                user_ids=np.array([face.user_id for face in self._faces], dtype=str),
+                counts=np.array([len(face.embeddings) for face in self._faces], dtype=np.int32),
+            )
+        os.replace(tmp, REGISTRY_PATH_NPZ)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def flush(self) -> None:
+        """Save now if identify() has accumulated unsaved embeddings."""
+        if self._dirty:
+            self.save()
 
     def identify(self, embedding: np.ndarray | None) -> str:
         """Return user_id for embedding. Creates new user if unknown."""
@@ -98,27 +167,37 @@ class FaceRegistry:
             logger.info("No face and no last user, creating anonymous user")
             return self._create_new_user(None)
 
-        best_match, best_dist = None, float("inf")
-        for face in self._faces:
-            dist = face.best_distance(embedding)
-            if dist < best_dist:
-                best_dist, best_match = dist, face
+        best_index, best_sim = self._nearest_last_user(embedding)
+        if best_sim < FAST_MATCH_SIMILARITY:
+            best_index, best_sim = self._nearest(embedding)
 
-        if best_match and best_dist < MATCH_THRESHOLD:
-            logger.info(f"Matched face to {best_match.user_id} (dist={best_dist:.3f})")
+        if best_index is not None and best_sim >= MATCH_SIMILARITY:
+            best_match = self._faces[best_index]
+            logger.info(f"Matched face to {best_match.user_id} (sim={best_sim:.3f})")
             self._last_identified_user = best_match.user_id
             self._consecutive_misses = 0
             self._last_miss_embedding = None
             # Strengthen the model by accumulating this embedding
+            rows = len(best_match.embeddings)
             best_match.add_embedding(embedding)
-            self.save()
+            if len(best_match.embeddings) == rows:
+                # At capacity the face keeps its row count, so overwrite its
+                # rows in place instead of restacking every user
+                gallery, _, starts = self._build_gallery()
+                start = starts[best_index]
+                gallery[start:start + rows] = best_match.embeddings
+            else:
+                self._gallery = None
+            self._dirty = True
+            if time.monotonic() - self._last_save >= SAVE_INTERVAL:
+                self.save()
             return best_match.user_id
 
         # No match - but don't create a new user until we've missed N times
         self._consecutive_misses += 1
         self._last_miss_embedding = embedding
         logger.info(
-            f"No match (best={best_dist:.3f}, threshold={MATCH_THRESHOLD}, "
+            f"No match (best={best_sim:.3f}, threshold={MATCH_SIMILARITY:.2f}, "
             f"miss {self._consecutive_misses}/{NEW_USER_CONSECUTIVE_MISSES})"
         )
 
@@ -132,11 +211,48 @@ class FaceRegistry:
             return self._last_identified_user
         return self._create_new_user(embedding)
 
+    def _build_gallery(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the stacked gallery, each row's owner and each face's first row.
+
+        They are restacked only if a mutation dropped the cache.
+        """
+        if self._gallery is None or self._owners is None or self._starts is None:
+            self._gallery = np.concatenate(
+                [f.embeddings for f in self._faces] or [np.empty((0, EMBEDDING_DIM), np.float32)]
+            )
+            counts = [len(f.embeddings) for f in self._faces]
+            self._owners = np.repeat(np.arange(len(self._faces), dtype=np.int32), counts)
+            self._starts = np.cumsum([0] + counts[:-1])
+            self._user_index = {f.user_id: i for i, f in enumerate(self._faces)}
+        return self._gallery, self._owners, self._starts
+
+    def _nearest(self, embedding: np.ndarray) -> tuple[int | None, float]:
+        """Return the index of the most similar face and its cosine similarity (one matmul)."""
+        gallery, owners, _ = self._build_gallery()
+        if not len(gallery):
+            return None, -1.0
+        sims = gallery @ normalize(embedding)
+        i = int(sims.argmax())
+        return int(owners[i]), float(sims[i])
+
+    def _nearest_last_user(self, embedding: np.ndarray) -> tuple[int | None, float]:
+        """Return the last identified user's face index and similarity, scoring only their rows."""
+        if self._last_identified_user is None:
+            return None, -1.0
+        gallery, _, starts = self._build_gallery()
+        index = self._user_index.get(self._last_identified_user)
+        if index is None:
+            return None, -1.0
+        start = starts[index]
+        rows = gallery[start:start + len(self._faces[index].embeddings)]
+        return index, float((rows @ normalize(embedding)).max())
+
     def _create_new_user(self, embedding: np.ndarray | None) -> str:
         """Create a new user with optional initial embedding."""
         user_id = f"user_{uuid.uuid4().hex[:8]}"
         if embedding is not None:
-            self._faces.append(RegisteredFace(user_id, [embedding]))
+            self._faces.append(RegisteredFace(user_id, embedding[None]))
+            self._gallery = None
             self.save()
             logger.info(f"Registered new face: {user_id}")
         self._last_identified_user = user_id
@@ -160,18 +276,37 @@ class FaceRegistry:
         Returns:
             True if registered successfully
         """
+        return self.register_user_bulk(user_id, [embedding])
+
+    def register_user_bulk(self, user_id: str, embeddings: list[np.ndarray]) -> bool:
+        """Register several faces for one user ID with a single save.
+
+        Args:
+            user_id: The desired user ID (e.g., "kaya")
+            embeddings: Face embeddings from face_recognition, oldest first
+
+        Returns:
+            True if registered successfully, False if embeddings is empty
+        """
+        if not embeddings:
+            return False
+
         # Check if user already exists
         for face in self._faces:
             if face.user_id == user_id:
-                face.add_embedding(embedding)
+                for embedding in embeddings:
+                    face.add_embedding(embedding)
+                self._gallery = None
                 self.save()
                 logger.info(f"Updated existing user: {user_id} (now has {len(face.embeddings)} embeddings)")
                 return True
 
         # Create new user
-        self._faces.append(RegisteredFace(user_id, [embedding]))
+        face = RegisteredFace(user_id, np.asarray(embeddings[-MAX_EMBEDDINGS_PER_USER:]))
+        self._faces.append(face)
+        self._gallery = None
         self.save()
-        logger.info(f"Registered new user: {user_id}")
+        logger.info(f"Registered new user: {user_id} ({len(face.embeddings)} embeddings)")
         return True
 
     def delete_user(self, user_id: str) -> bool:
@@ -186,6 +321,7 @@ class FaceRegistry:
         for i, face in enumerate(self._faces):
             if face.user_id == user_id:
                 self._faces.pop(i)
+                self._gallery = None
                 self.save()
                 logger.info(f"Deleted user: {user_id}")
                 return True
@@ -3,8 +3,10 @@
 Wraps the Honcho API v2 for conversation memory with per-user sessions.
 """
 
+import asyncio
 import logging
 import os
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,10 @@ except ImportError:
     HONCHO_AVAILABLE = False
     logger.warning("Honcho not available - memory disabled")
 
+CONTEXT_QUERY = "What do I know about this user?"
+CONTEXT_TTL = 30.0  # Seconds a user's search context is reused between turns
+SAVE_QUEUE_SIZE = 32  # Exchanges waiting to be written before save() drops new ones
+
 
 class ConversationMemory:
     """Wrapper for Honcho memory with per-user sessions."""
@@ -28,6 +34,10 @@ class ConversationMemory:
         self.app_name = app_name
         self._client = None
         self._sessions = {}  # user_id -> session object
+        self._ctx_cache: dict[tuple[str, str], tuple[float, str]] = {}  # (user_id, query) -> (time, context)
+        # Exchanges are written by one background task, in order, off the reply path
+        self._save_queue: asyncio.Queue | None = None
+        self._save_task: asyncio.Task | None = None
 
         api_key = os.getenv("HONCHO_API_KEY")
         if not api_key:
@@ -72,6 +82,11 @@ class ConversationMemory:
             logger.error(f"Failed to create session for {user_id}: {e}")
             return None
 
+    def _invalidate_context(self, user_id: str) -> None:
+        """Drop cached search context for a user whose memory is changing."""
+        for key in [k for k in self._ctx_cache if k[0] == user_id]:
+            del self._ctx_cache[key]
+
     async def get_context(self, user_id: str) -> str:
         """Get memory context for a user."""
         if not self.is_available():
@@ -82,29 +97,65 @@ class ConversationMemory:
             if not session:
                 return ""
 
-            results = session.search(query="What do I know about this user?")
-            if results:
-                context_parts = []
-                for r in results:
-                    if hasattr(r, 'content'):
-                        context_parts.append(r.content)
-                return "\n".join(context_parts) if context_parts else ""
-            return ""
+            key = (user_id, CONTEXT_QUERY)
+            cached = self._ctx_cache.get(key)
+            if cached and time.monotonic() - cached[0] < CONTEXT_TTL:
+                return cached[1]
+
+            results = session.search(query=CONTEXT_QUERY)
+            context = "\n".join(r.content for r in results or () if hasattr(r, 'content'))
+            self._ctx_cache[key] = (time.monotonic(), context)
+            return context
         except Exception as e:
             logger.debug(f"Failed to get context for {user_id}: {e}")
             return ""
 
     async def save(self, user_id: str, user_msg: str, assistant_msg: str) -> bool:
-        """Save a conversation exchange to memory."""
+        """Queue a conversation exchange to be saved to memory in the background.
+
+        Returns True if the exchange was queued; it is written by a single
+        worker task so exchanges reach Honcho in order.
+        """
         if not self.is_available():
             return False
 
+        if self._save_task is None:
+            self._save_queue = asyncio.Queue(maxsize=SAVE_QUEUE_SIZE)
+            self._save_task = asyncio.create_task(self._save_worker())
+        try:
+            self._save_queue.put_nowait((user_id, user_msg, assistant_msg))
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Memory save queue full, dropping exchange for {user_id}")
+            return False
+
+    async def flush(self) -> None:
+        """Wait for queued exchanges to be saved, then stop the save worker."""
+        if self._save_task is None:
+            return
+        await self._save_queue.join()
+        self._save_task.cancel()
+        self._save_task = None
+
+    async def _save_worker(self) -> None:
+        """Write queued exchanges one at a time."""
+        while True:
+            exchange = await self._save_queue.get()
+            try:
+                # Honcho's client is blocking; keep it off the event loop
+                await asyncio.to_thread(self._save_exchange, *exchange)
+            finally:
+                self._save_queue.task_done()
+
+    def _save_exchange(self, user_id: str, user_msg: str, assistant_msg: str) -> bool:
+        """Save a conversation exchange to memory."""
         try:
             session = self._get_or_create_session(user_id)
             if not session:
                 return False
 
-            # Add messages with peer_id
+            # Add messages with peer_id (cached context is kept: this
+            # exchange is already in the live conversation history)
             session.add_messages({"peer_id": "user", "content": user_msg})
             session.add_messages({"peer_id": "assistant", "content": assistant_msg})
             logger.debug(f"Saved exchange to Honcho for {user_id}")
@@ -143,6 +194,7 @@ class ConversationMemory:
             if not session:
                 return False
 
+            self._invalidate_context(user_id)
             session.add_messages({"peer_id": "user", "content": f"Remember: {fact}"})
             session.add_messages({"peer_id": "assistant", "content": f"I'll remember: {fact}"})
             logger.info(f"Saved conclusion for {user_id}: {fact}")
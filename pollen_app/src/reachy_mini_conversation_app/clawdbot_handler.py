@@ -7,10 +7,10 @@ This handler replaces OpenAI Realtime API with a modular stack:
 - Memory: Honcho for persistent user context
 """
 
-import io
 import os
 import json
 import base64
+import struct
 import asyncio
 import logging
 from typing import Any, Final, Tuple, Literal
@@ -19,8 +19,7 @@ from dataclasses import dataclass
 import httpx
 import numpy as np
 from numpy.typing import NDArray
-from pydub import AudioSegment
-from scipy.signal import resample
+from scipy.signal import firwin, resample_poly
 from fastrtc import AdditionalOutputs, AsyncStreamHandler, wait_for_item, audio_to_int16
 
 from reachy_mini_conversation_app.prompts import get_session_instructions
@@ -35,7 +34,26 @@ logger = logging.getLogger(__name__)
 # Audio configuration
 FASTRTC_SAMPLE_RATE: Final[Literal[24000]] = 24000  # fastrtc default
 WHISPER_SAMPLE_RATE: Final[int] = 16000  # Whisper expects 16kHz
-ELEVENLABS_OUTPUT_RATE: Final[int] = 44100  # ElevenLabs outputs 44.1kHz MP3
+INPUT_BUFFER_SECONDS: Final[int] = 30  # Longest utterance kept; older audio is dropped
+TTS_PCM_RATE: Final[int] = 16000  # ElevenLabs pcm_16000 output, streamed as-is to the bridge
+
+# 24kHz -> 16kHz is an exact 2/3 ratio, so speech is resampled polyphase
+# with one anti-aliasing FIR designed up front instead of per utterance
+RESAMPLE_UP: Final[int] = 2
+RESAMPLE_DOWN: Final[int] = 3
+_RESAMPLE_FIR = firwin(2 * 10 * RESAMPLE_DOWN + 1, 0.95 / RESAMPLE_DOWN, window=("kaiser", 14.0))
+
+# Canonical 44-byte RIFF header; only the two size fields vary per utterance
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def _wav_header(data_size: int) -> bytes:
+    """Build the WAV header for data_size bytes of 16-bit mono PCM at WHISPER_SAMPLE_RATE."""
+    return _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, WHISPER_SAMPLE_RATE, WHISPER_SAMPLE_RATE * 2, 2, 16,
+        b"data", data_size,
+    )
 
 
 @dataclass
@@ -50,6 +68,7 @@ class ClawdbotConfig:
     elevenlabs_voice_id: str
     honcho_api_key: str | None
     honcho_workspace: str
+    stt_model: str = "gpt-4o-mini-transcribe"  # Or gpt-4o-transcribe, whisper-1
 
     @classmethod
     def from_env(cls) -> "ClawdbotConfig":
@@ -67,6 +86,7 @@ class ClawdbotConfig:
             elevenlabs_voice_id=os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM"),
             honcho_api_key=os.getenv("HONCHO_API_KEY"),
             honcho_workspace=os.getenv("HONCHO_WORKSPACE_ID", "reachy-mini"),
+            stt_model=os.getenv("STT_MODEL", "gpt-4o-mini-transcribe"),
         )
 
 
@@ -92,8 +112,11 @@ class ClawdbotHandler(AsyncStreamHandler):
         self.deps = deps
         self.gradio_mode = gradio_mode
 
-        # Audio buffers
-        self.input_buffer: list[NDArray[np.int16]] = []
+        # Audio buffers: input is written into one preallocated buffer while
+        # the previous utterance is processed straight out of the other
+        self._input_buf: NDArray[np.int16] = np.zeros(FASTRTC_SAMPLE_RATE * INPUT_BUFFER_SECONDS, dtype=np.int16)
+        self._spare_buf: NDArray[np.int16] = np.zeros_like(self._input_buf)
+        self._input_len = 0
         self.output_queue: asyncio.Queue[
             Tuple[int, NDArray[np.int16]] | AdditionalOutputs
         ] = asyncio.Queue()
@@ -103,21 +126,22 @@ class ClawdbotHandler(AsyncStreamHandler):
         self._silence_frames = 0
         self._speech_frames = 0
         self._vad_threshold = 500  # RMS threshold for speech
+        self._vad_thresh_sq = self._vad_threshold**2  # Compared against mean square, no sqrt
         self._min_speech_frames = 10  # ~200ms at 50fps
         self._max_silence_frames = 25  # ~500ms silence to end utterance
 
         # Processing state
         self._processing_lock = asyncio.Lock()
         self._is_processing = False
+        self._memory_saves: set[asyncio.Task[None]] = set()  # Fire-and-forget, awaited on shutdown
 
         # Clients (lazy init in start_up)
-        self._stt = None
-        self._tts = None
-        self._llm = None
+        self._http: httpx.AsyncClient | None = None
         self._memory = None
 
         # Conversation state
         self._conversation_history: list[dict] = []
+        self._system_prompt: str | None = None  # Loaded on first turn, reset by apply_personality
 
         # Tool specs converted to Claude format
         self._tool_specs: list[dict] = []
@@ -126,6 +150,13 @@ class ClawdbotHandler(AsyncStreamHandler):
         self.last_activity_time = 0.0
         self.start_time = 0.0
 
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created by start_up."""
+        if self._http is None:
+            raise RuntimeError("ClawdbotHandler.start_up() has not been called")
+        return self._http
+
     def copy(self) -> "ClawdbotHandler":
         """Create a copy of the handler."""
         return ClawdbotHandler(self.config, self.deps, self.gradio_mode)
@@ -136,14 +167,12 @@ class ClawdbotHandler(AsyncStreamHandler):
 
         logger.info("Starting ClawdbotHandler...")
 
-        # Initialize Whisper STT client
-        self._stt_client = httpx.AsyncClient(timeout=30.0)
-
-        # Initialize ElevenLabs TTS client
-        self._tts_client = httpx.AsyncClient(timeout=30.0)
-
-        # Initialize Clawdbot LLM client
-        self._llm_client = httpx.AsyncClient(timeout=60.0)
+        # One pooled client for Whisper STT, ElevenLabs TTS, Clawdbot and the
+        # bridge, so every host keeps its warm keep-alive connections
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=5.0, read=60.0, write=30.0, pool=60.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
 
         # Initialize Honcho memory (optional)
         if self.config.honcho_api_key:
@@ -209,10 +238,11 @@ class ClawdbotHandler(AsyncStreamHandler):
                 audio = audio[:, 0]
         audio = audio.flatten()
 
-        # Simple RMS-based VAD
-        rms = np.sqrt(np.mean(audio.astype(np.float32) ** 2))
+        # Simple RMS-based VAD, as sum(x^2) > threshold^2 * n: the int64
+        # accumulation needs no float copy of the frame and no sqrt
+        energy = np.einsum("i,i->", audio, audio, dtype=np.int64)
 
-        if rms > self._vad_threshold:
+        if energy > self._vad_thresh_sq * audio.size:
             self._speech_frames += 1
             self._silence_frames = 0
             if not self._is_speaking and self._speech_frames >= self._min_speech_frames:
@@ -229,37 +259,53 @@ class ClawdbotHandler(AsyncStreamHandler):
                     self.deps.movement_manager.set_listening(False)
                     logger.debug("Speech ended, processing...")
 
-                    # Copy buffer and clear
-                    audio_to_process = self.input_buffer.copy()
-                    self.input_buffer.clear()
+                    # Hand off the filled buffer and record into the spare one
+                    audio_to_process = self._input_buf[:self._input_len]
+                    self._input_buf, self._spare_buf = self._spare_buf, self._input_buf
+                    self._input_len = 0
 
                     # Process in background
                     asyncio.create_task(self._process_speech(audio_to_process))
 
         # Accumulate audio while speaking
         if self._is_speaking or self._silence_frames < self._max_silence_frames:
-            self.input_buffer.append(audio)
-
-    async def _process_speech(self, audio_chunks: list[NDArray[np.int16]]) -> None:
+            self._append_input(audio)
+
+    def _append_input(self, audio: NDArray[np.int16]) -> None:
+        """Append a frame to the input buffer, keeping only the newest audio once full."""
+        buf = self._input_buf
+        audio = audio[-buf.size:]
+        n = audio.size
+        if self._input_len + n > buf.size:
+            keep = buf.size - n
+            buf[:keep] = buf[self._input_len - keep:self._input_len]
+            self._input_len = keep
+        buf[self._input_len:self._input_len + n] = audio
+        self._input_len += n
+
+    async def _process_speech(self, audio_data: NDArray[np.int16]) -> None:
         """Process accumulated speech: STT -> Memory -> LLM -> TTS."""
         async with self._processing_lock:
             self._is_processing = True
             try:
-                if not audio_chunks:
+                if not audio_data.size:
                     return
 
-                # Combine audio chunks
-                audio_data = np.concatenate(audio_chunks)
+                # Honcho context depends only on the user, so fetch it while STT runs
+                context_task = (
+                    asyncio.create_task(self._get_memory_context()) if self._memory_client else None
+                )
 
                 # Resample from 24kHz to 16kHz for Whisper
-                resampled = resample(
-                    audio_data,
-                    int(len(audio_data) * WHISPER_SAMPLE_RATE / FASTRTC_SAMPLE_RATE),
+                resampled = resample_poly(
+                    audio_data, RESAMPLE_UP, RESAMPLE_DOWN, window=_RESAMPLE_FIR
                 ).astype(np.int16)
 
                 # STT
                 transcript = await self._transcribe(resampled.tobytes())
                 if not transcript:
+                    if context_task:
+                        context_task.cancel()
                     return
 
                 logger.info(f"User: {transcript}")
@@ -268,7 +314,7 @@ class ClawdbotHandler(AsyncStreamHandler):
                 )
 
                 # Get Honcho context
-                context = await self._get_memory_context() if self._memory_client else None
+                context = await context_task if context_task else None
 
                 # LLM with tool calling
                 response, tool_calls = await self._chat_with_tools(transcript, context)
@@ -297,13 +343,15 @@ class ClawdbotHandler(AsyncStreamHandler):
                         AdditionalOutputs({"role": "assistant", "content": response})
                     )
 
+                    # Save to memory in the background, overlapping playback
+                    if self._memory_client:
+                        task = asyncio.create_task(self._save_to_memory(transcript, response))
+                        self._memory_saves.add(task)
+                        task.add_done_callback(self._memory_saves.discard)
+
                     # TTS and queue audio
                     await self._speak(response)
 
-                    # Save to memory
-                    if self._memory_client:
-                        await self._save_to_memory(transcript, response)
-
                 # Update activity time
                 self.last_activity_time = asyncio.get_event_loop().time()
 
@@ -313,32 +361,20 @@ class ClawdbotHandler(AsyncStreamHandler):
                 self._is_processing = False
 
     async def _transcribe(self, audio_bytes: bytes) -> str | None:
-        """Transcribe audio using Whisper."""
+        """Transcribe audio using the OpenAI transcription API (config.stt_model)."""
         if not audio_bytes or len(audio_bytes) < 500:
             return None
 
         # Convert raw PCM to WAV
-        import wave
-
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, "wb") as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)  # 16-bit
-            wav.setframerate(WHISPER_SAMPLE_RATE)
-            wav.writeframes(audio_bytes)
-        wav_buffer.seek(0)
+        wav_bytes = _wav_header(len(audio_bytes)) + audio_bytes
 
         url = "https://api.openai.com/v1/audio/transcriptions"
         headers = {"Authorization": f"Bearer {self.config.openai_api_key}"}
-        files = {
-            "file": ("audio.wav", wav_buffer, "audio/wav"),
-            "model": (None, "whisper-1"),
-            "language": (None, "en"),
-            "response_format": (None, "text"),
-        }
+        files = {"file": ("audio.wav", wav_bytes, "audio/wav")}
+        data = {"model": self.config.stt_model, "language": "en", "response_format": "text"}
 
         try:
-            response = await self._stt_client.post(url, headers=headers, files=files)
+            response = await self._client.post(url, headers=headers, files=files, data=data, timeout=30.0)
             response.raise_for_status()
             text = response.text.strip()
 
@@ -389,10 +425,16 @@ class ClawdbotHandler(AsyncStreamHandler):
         self, user_message: str, context: str | None
     ) -> Tuple[str, list[dict]]:
         """Chat with Clawdbot, handling tool calls."""
-        # Build messages
-        system_prompt = get_session_instructions()
+        # Build messages so everything that repeats between turns (system
+        # prompt, then history) is a stable prefix the provider can cache;
+        # per-turn memory context goes last, next to the new message
+        if self._system_prompt is None:
+            self._system_prompt = get_session_instructions()
 
-        messages = [{"role": "system", "content": system_prompt}]
+        messages = [{"role": "system", "content": self._system_prompt}]
+
+        # Add conversation history
+        messages.extend(self._conversation_history)
 
         if context:
             messages.append({
@@ -400,9 +442,6 @@ class ClawdbotHandler(AsyncStreamHandler):
                 "content": f"[User Context from Memory]\n{context}",
             })
 
-        # Add conversation history
-        messages.extend(self._conversation_history)
-
         # Add current message
         messages.append({"role": "user", "content": user_message})
 
@@ -420,7 +459,7 @@ class ClawdbotHandler(AsyncStreamHandler):
         }
 
         try:
-            response = await self._llm_client.post(
+            response = await self._client.post(
                 self.config.clawdbot_endpoint,
                 json=payload,
                 headers=headers,
@@ -472,7 +511,6 @@ class ClawdbotHandler(AsyncStreamHandler):
         headers = {
             "xi-api-key": self.config.elevenlabs_api_key,
             "Content-Type": "application/json",
-            "Accept": "audio/mpeg",
         }
         payload = {
             "text": text,
@@ -484,50 +522,43 @@ class ClawdbotHandler(AsyncStreamHandler):
         }
 
         try:
-            response = await self._tts_client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            mp3_bytes = response.content
-
-            # Get audio duration for head animation timing
-            audio_segment = AudioSegment.from_mp3(io.BytesIO(mp3_bytes))
-            duration_sec = len(audio_segment) / 1000.0
-
-            # Save MP3 to temp file
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                f.write(mp3_bytes)
-                temp_path = f.name
-
-            # Start head animation concurrently with audio playback
             # Use bridge HTTP endpoint instead of SDK media (works with no_media backend)
             robot_ip = os.getenv("ROBOT_IP", "192.168.23.66")
-            bridge_url = f"http://{robot_ip}:9000/play"
-
-            # Convert MP3 to WAV at 16kHz mono for bridge playback
-            audio_16k = audio_segment.set_frame_rate(16000).set_channels(1)
-            wav_buffer = io.BytesIO()
-            audio_16k.export(wav_buffer, format="wav")
-            wav_bytes = wav_buffer.getvalue()
+            bridge_url = f"http://{robot_ip}:9000/play_stream"
+            finished = asyncio.Event()
 
-            logger.info(f"Playing TTS via bridge: {len(wav_bytes)} bytes, {duration_sec:.1f}s")
-
-            async def play_on_bridge():
+            async def stream_to_bridge() -> None:
+                # Relay raw PCM chunks to the bridge as ElevenLabs produces
+                # them, so playback starts before synthesis finishes
                 try:
-                    async with httpx.AsyncClient() as client:
-                        resp = await client.post(bridge_url, content=wav_bytes, headers={"Content-Type": "audio/wav"}, timeout=30.0)
-                        logger.info(f"Bridge response: {resp.status_code} - {resp.text[:100]}")
-                except Exception as e:
-                    logger.error(f"Bridge playback error: {e}")
+                    async with self._client.stream(
+                        "POST",
+                        f"{url}/stream",
+                        params={"output_format": f"pcm_{TTS_PCM_RATE}"},
+                        json=payload,
+                        headers=headers,
+                    ) as response:
+                        response.raise_for_status()
+                        logger.info("Streaming TTS to bridge")
+                        try:
+                            resp = await self._client.post(
+                                bridge_url,
+                                params={"rate": TTS_PCM_RATE},
+                                content=response.aiter_bytes(),
+                                timeout=30.0,
+                            )
+                            logger.info(f"Bridge response: {resp.status_code} - {resp.text[:100]}")
+                        except Exception as e:
+                            logger.error(f"Bridge playback error: {e}")
+                finally:
+                    finished.set()
 
             # Run head animation and audio playback concurrently
             await asyncio.gather(
-                self._animate_head_while_speaking(duration_sec),
-                play_on_bridge(),
+                self._animate_head_while_speaking(finished),
+                stream_to_bridge(),
             )
 
-            # Clean up temp file
-            os.unlink(temp_path)
-
             # Reset head to neutral position after speaking
             movement_manager = self.deps.movement_manager
             if movement_manager:
@@ -540,8 +571,8 @@ class ClawdbotHandler(AsyncStreamHandler):
             if self.deps.movement_manager:
                 self.deps.movement_manager.set_speech_offsets((0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
 
-    async def _animate_head_while_speaking(self, duration_sec: float) -> None:
-        """Animate head with expressive movements while speaking."""
+    async def _animate_head_while_speaking(self, finished: asyncio.Event) -> None:
+        """Animate head with expressive movements until playback has finished."""
         import math
 
         movement_manager = self.deps.movement_manager
@@ -551,10 +582,8 @@ class ClawdbotHandler(AsyncStreamHandler):
         start_time = asyncio.get_event_loop().time()
         update_interval = 0.05  # Update every 50ms for smoother animation
 
-        while True:
+        while not finished.is_set():
             elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed >= duration_sec:
-                break
 
             # Generate expressive head movements - MORE PRONOUNCED
             t = elapsed * 2.5  # Animation speed
@@ -600,12 +629,14 @@ class ClawdbotHandler(AsyncStreamHandler):
 
     async def shutdown(self) -> None:
         """Clean up resources."""
-        for client in [self._stt_client, self._tts_client, self._llm_client]:
-            if client:
-                try:
-                    await client.aclose()
-                except Exception:
-                    pass
+        if self._memory_saves:
+            await asyncio.gather(*self._memory_saves, return_exceptions=True)
+
+        if self._http:
+            try:
+                await self._http.aclose()
+            except Exception:
+                pass
 
         # Clear queue
         while not self.output_queue.empty():
@@ -619,12 +650,13 @@ class ClawdbotHandler(AsyncStreamHandler):
     async def apply_personality(self, profile: str | None) -> str:
         """Apply a new personality profile at runtime.
 
-        Unlike OpenAI Realtime, we just need to update the config since
-        we fetch instructions fresh on each chat call.
+        Unlike OpenAI Realtime, we just need to update the config and drop
+        the cached instructions so the next chat call reloads them.
         """
         from reachy_mini_conversation_app.config import set_custom_profile
 
         set_custom_profile(profile)
+        self._system_prompt = None
         # Clear conversation history to apply new personality
         self._conversation_history.clear()
         return f"Applied personality: {profile or 'default'}"
@@ -4,11 +4,11 @@ import asyncio
 import logging
 import os
 import threading
-from typing import Any, Callable
+from typing import Any
 
 import numpy as np
 
-from reachy_mini_conversation_app.vision import VisionSystem
+from reachy_mini_conversation_app.vision import FrameSource, VisionSystem, frame_thumbnail, frames_similar
 from reachy_mini_conversation_app.face_registry import FaceRegistry
 
 logger = logging.getLogger(__name__)
@@ -28,7 +28,7 @@ class FaceIdentityManager:
         self.registry = FaceRegistry.load()
 
         # Determine frame source
-        frame_source: Callable[[], np.ndarray | None] | None = None
+        frame_source: FrameSource | None = None
 
         if camera_worker is not None:
             # Use SDK camera worker (running on robot or with working WebRTC)
@@ -47,6 +47,7 @@ class FaceIdentityManager:
         self.vision = VisionSystem(frame_source=frame_source)
 
         self._current_user_id: str | None = None
+        self._last_thumbnail: np.ndarray | None = None  # Of the last frame actually identified
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
@@ -63,6 +64,7 @@ class FaceIdentityManager:
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=2.0)
+        self.registry.flush()
         logger.info("Face identity manager stopped")
 
     def _run_loop(self) -> None:
@@ -80,7 +82,21 @@ class FaceIdentityManager:
 
         while not self._stop_event.is_set():
             try:
-                embedding = await self.vision.get_face_embedding()
+                frame = await self.vision.capture_frame()
+                if frame is not None:
+                    thumbnail = frame_thumbnail(frame)
+                    if (
+                        self._current_user_id is not None
+                        and self._last_thumbnail is not None
+                        and frames_similar(thumbnail, self._last_thumbnail)
+                    ):
+                        # Same scene as the last identified frame: keep the current user
+                        await asyncio.sleep(0.5)
+                        continue
+                    self._last_thumbnail = thumbnail
+                    embedding = await self.vision.get_face_embedding(frame)
+                else:
+                    embedding = None
                 user_id = self.registry.identify(embedding)
                 self._current_user_id = user_id
                 await asyncio.sleep(0.5)  # Check every 500ms
@@ -4,16 +4,37 @@ Fetches camera frames from the bridge's /snapshot endpoint,
 allowing face recognition to work when running from macOS.
 """
 
-import logging
 import os
+import asyncio
+import logging
 
 import cv2
 import httpx
 import numpy as np
 
+
+# libjpeg-turbo (SIMD) for snapshot decoding, if installed
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+    _turbojpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+    TURBOJPEG_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def decode_jpeg(data: bytes) -> np.ndarray | None:
+    """Decode JPEG bytes to a BGR frame, via libjpeg-turbo when available."""
+    frame: np.ndarray | None
+    if TURBOJPEG_AVAILABLE:
+        frame = _turbojpeg.decode(data, pixel_format=TJPF_BGR)
+    else:
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    return frame
+
+
 class HTTPCamera:
     """Fetch camera frames via HTTP from the robot's bridge."""
 
@@ -23,25 +44,25 @@ class HTTPCamera:
         Args:
             robot_ip: Robot IP address. Defaults to ROBOT_IP env var or 192.168.23.66.
             port: Bridge port. Defaults to 9000.
+
         """
         if robot_ip is None:
             robot_ip = os.getenv("ROBOT_IP", "192.168.23.66")
         self.url = f"http://{robot_ip}:{port}/snapshot"
-        self._client = httpx.Client(timeout=2.0)
+        self._client = httpx.AsyncClient(timeout=2.0)
         logger.info(f"HTTPCamera initialized: {self.url}")
 
-    def get_frame(self) -> np.ndarray | None:
+    async def get_frame(self) -> np.ndarray | None:
         """Fetch current camera frame as BGR numpy array.
 
         Returns:
             Frame as numpy array (BGR format) or None if unavailable.
+
         """
         try:
-            resp = self._client.get(self.url)
+            resp = await self._client.get(self.url)
             if resp.status_code == 200:
-                arr = np.frombuffer(resp.content, np.uint8)
-                frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-                return frame
+                return await asyncio.to_thread(decode_jpeg, resp.content)
             else:
                 logger.debug(f"Snapshot failed: {resp.status_code}")
         except httpx.TimeoutException:
@@ -50,6 +71,6 @@ class HTTPCamera:
             logger.debug(f"Snapshot error: {e}")
         return None
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Close HTTP client."""
-        self._client.close()
+        await self._client.aclose()
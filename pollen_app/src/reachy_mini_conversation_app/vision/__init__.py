@@ -1,5 +1,11 @@
 """Vision module for face detection and tracking."""
 
-from reachy_mini_conversation_app.vision.face_detection import VisionSystem, Face
+from reachy_mini_conversation_app.vision.face_detection import (
+    Face,
+    FrameSource,
+    VisionSystem,
+    frame_thumbnail,
+    frames_similar,
+)
 
-__all__ = ["VisionSystem", "Face"]
+__all__ = ["VisionSystem", "Face", "FrameSource", "frame_thumbnail", "frames_similar"]
@@ -1,10 +1,11 @@
 """Vision module for face detection."""
 
 import asyncio
+import inspect
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Awaitable, Callable, cast
 
 import cv2
 import mediapipe as mp
@@ -23,6 +24,23 @@ logger = logging.getLogger(__name__)
 
 MODEL_URL = "https://storage.googleapis.com/mediapipe-models/face_detector/blaze_face_short_range/float16/1/blaze_face_short_range.tflite"
 MODEL_PATH = Path("~/.reachy/models/blaze_face_short_range.tflite").expanduser()
+# Mean change of a frame's thumbnail, as a fraction of full scale, below
+# which it is treated as the same scene and not re-identified
+FRAME_CHANGE_THRESHOLD = 0.005
+
+# A blocking frame getter (run in a worker thread) or a coroutine function
+FrameSource = Callable[[], np.ndarray | None] | Callable[[], Awaitable[np.ndarray | None]]
+
+
+def frame_thumbnail(frame: np.ndarray) -> np.ndarray:
+    """Shrink a BGR frame to a 16x16 grayscale thumbnail for cheap change checks."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (16, 16), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def frames_similar(a: np.ndarray, b: np.ndarray) -> bool:
+    """Whether two frame thumbnails differ by less than FRAME_CHANGE_THRESHOLD."""
+    return float(np.abs(a - b).mean()) < FRAME_CHANGE_THRESHOLD * 255
 
 
 @dataclass
@@ -58,11 +76,12 @@ async def _ensure_model() -> Path:
 class VisionSystem:
     """Face detection for robot gaze tracking."""
 
-    def __init__(self, frame_source: Callable[[], np.ndarray | None] | None = None):
+    def __init__(self, frame_source: FrameSource | None = None):
         self._frame_source = frame_source
         self._face_detector: mp_vision.FaceDetector | None = None
         self._running = False
         self._min_frame_interval_seconds = 0.02
+        self._rgb_buf: np.ndarray | None = None  # Reused by get_face_embedding
 
     async def start(self) -> None:
         """Start face detection."""
@@ -90,7 +109,7 @@ class VisionSystem:
         if not self._frame_source or not self._face_detector:
             return []
 
-        frame = await asyncio.to_thread(self._frame_source)
+        frame = await self._read_frame()
 
         if frame is None:
             return []
@@ -101,10 +120,13 @@ class VisionSystem:
 
     def _detect_faces_sync(self, frame: np.ndarray) -> list[Face]:
         """Run synchronous face detection on a frame and return results."""
+        return self._detect_faces_rgb(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    def _detect_faces_rgb(self, rgb_frame: np.ndarray) -> list[Face]:
+        """Run synchronous face detection on an already converted RGB frame."""
         if not self._face_detector:
             return []
 
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
         result = self._face_detector.detect(mp_image)
 
@@ -125,7 +147,7 @@ class VisionSystem:
         if not self._frame_source:
             return None
 
-        frame = await asyncio.to_thread(self._frame_source)
+        frame = await self._read_frame()
         if frame is None:
             return None
 
@@ -141,25 +163,45 @@ class VisionSystem:
         _, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
         return encoded.tobytes()
 
-    async def get_face_embedding(self) -> np.ndarray | None:
+    async def capture_frame(self) -> np.ndarray | None:
+        """Grab the current BGR frame from the frame source."""
+        if not self._frame_source:
+            return None
+        return await self._read_frame()
+
+    async def _read_frame(self) -> np.ndarray | None:
+        """Read a frame, awaiting async sources and threading blocking ones."""
+        source = self._frame_source
+        if source is None:
+            return None
+        if inspect.iscoroutinefunction(source):
+            return await cast(Callable[[], Awaitable[np.ndarray | None]], source)()
+        return await asyncio.to_thread(cast(Callable[[], np.ndarray | None], source))
+
+    async def get_face_embedding(self, frame: np.ndarray | None = None) -> np.ndarray | None:
         """Extract face embedding for largest face in frame.
 
         Uses MediaPipe for detection (more reliable) and face_recognition for embeddings.
+        Captures a new frame unless one is given.
         Returns None if face_recognition is not available.
         """
         if not FACE_RECOGNITION_AVAILABLE:
             logger.debug("Face recognition not available, skipping embedding")
             return None
 
-        if not self._frame_source or not self._face_detector:
+        if not self._face_detector:
             return None
 
-        frame = await asyncio.to_thread(self._frame_source)
         if frame is None:
-            return None
+            frame = await self.capture_frame()
+            if frame is None:
+                return None
+
+        # Convert once, into a reused buffer, for both detection and embedding
+        rgb = await asyncio.to_thread(self._to_rgb, frame)
 
         # Use MediaPipe for face detection (same as gaze tracking, known to work)
-        faces = await asyncio.to_thread(self._detect_faces_sync, frame)
+        faces = await asyncio.to_thread(self._detect_faces_rgb, rgb)
         if not faces:
             return None
 
@@ -169,12 +211,17 @@ class VisionSystem:
 
         # Convert MediaPipe bbox (x, y, w, h) to face_recognition format (top, right, bottom, left)
         location = (y, x + w, y + h, x)
-        return await asyncio.to_thread(self._extract_embedding_at_location, frame, location)
+        return await asyncio.to_thread(self._extract_embedding_at_location, rgb, location)
+
+    def _to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame into the reused RGB buffer."""
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
 
-    def _extract_embedding_at_location(self, frame: np.ndarray, location: tuple) -> np.ndarray | None:
-        """Extract face embedding at a known location."""
+    def _extract_embedding_at_location(self, rgb: np.ndarray, location: tuple) -> np.ndarray | None:
+        """Extract face embedding at a known location in an RGB frame."""
         if not FACE_RECOGNITION_AVAILABLE:
             return None
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         encodings = face_recognition.face_encodings(rgb, [location])
         return encodings[0] if encodings else None
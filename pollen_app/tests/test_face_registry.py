@@ -0,0 +1,176 @@
+"""Tests for the face identity registry."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import reachy_mini_conversation_app.face_registry as face_registry
+from reachy_mini_conversation_app.face_registry import (
+    EMBEDDING_DIM,
+    SAVE_INTERVAL,
+    MATCH_THRESHOLD,
+    MATCH_SIMILARITY,
+    MAX_EMBEDDINGS_PER_USER,
+    FaceRegistry,
+    RegisteredFace,
+)
+
+
+@pytest.fixture(autouse=True)
+def registry_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep every test's registry files out of the real home directory."""
+    path = tmp_path / "face_registry.npz"
+    monkeypatch.setattr(face_registry, "REGISTRY_PATH_NPZ", path)
+    monkeypatch.setattr(face_registry, "REGISTRY_PATH", tmp_path / "face_registry.json")
+    return path
+
+
+def _embedding(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    e = rng.normal(size=EMBEDDING_DIM)
+    return e / np.linalg.norm(e)
+
+
+def test_add_embedding_keeps_newest() -> None:
+    """Test a face keeps at most MAX_EMBEDDINGS_PER_USER rows, newest last."""
+    face = RegisteredFace("alice", [_embedding(0)])
+    for i in range(1, MAX_EMBEDDINGS_PER_USER + 3):
+        face.add_embedding(_embedding(i))
+    assert face.embeddings.shape == (MAX_EMBEDDINGS_PER_USER, EMBEDDING_DIM)
+    assert face.embeddings.dtype == np.float32
+    np.testing.assert_allclose(face.embeddings[-1], _embedding(MAX_EMBEDDINGS_PER_USER + 2), rtol=1e-6)
+
+
+def test_embeddings_stored_unit_norm() -> None:
+    """Test stored embeddings are normalized, so L2 and cosine thresholds agree."""
+    face = RegisteredFace("alice", [_embedding(0) * 3.0])
+    face.add_embedding(_embedding(1) * 0.5)
+    np.testing.assert_allclose(np.linalg.norm(face.embeddings, axis=1), 1.0, rtol=1e-6)
+
+
+@pytest.mark.parametrize("distance, matches", [(MATCH_THRESHOLD * 0.95, True), (MATCH_THRESHOLD * 1.05, False)])
+def test_similarity_threshold_tracks_l2_threshold(distance: float, matches: bool) -> None:
+    """Test MATCH_SIMILARITY accepts exactly the unit vectors within MATCH_THRESHOLD (L2)."""
+    base = _embedding(1)
+    ortho = _embedding(2) - (_embedding(2) @ base) * base
+    ortho /= np.linalg.norm(ortho)
+    # Unit vector at the given chord distance from base
+    angle = 2 * np.arcsin(distance / 2)
+    query = np.cos(angle) * base + np.sin(angle) * ortho
+
+    registry = FaceRegistry(_faces=[RegisteredFace("alice", [base])])
+    _, sim = registry._nearest(query)
+    assert (sim >= MATCH_SIMILARITY) is matches
+
+
+def test_identify_matches_closest_user() -> None:
+    """Test identify returns the registered user nearest to the embedding."""
+    registry = FaceRegistry(
+        _faces=[RegisteredFace("alice", [_embedding(1)]), RegisteredFace("bob", [_embedding(2)])]
+    )
+    assert registry.identify(_embedding(2) + 0.01) == "bob"
+    assert registry.identify(_embedding(1)) == "alice"
+
+
+def test_identify_leaves_last_user_for_better_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the last-user fast path falls back to a full scan when its match is loose."""
+    registry = FaceRegistry(
+        _faces=[RegisteredFace("alice", [_embedding(1)]), RegisteredFace("bob", [_embedding(2)])]
+    )
+    assert registry.identify(_embedding(1)) == "alice"
+
+    scans = []
+    nearest = registry._nearest
+    monkeypatch.setattr(registry, "_nearest", lambda e: scans.append(e) or nearest(e))
+    assert registry.identify(_embedding(1)) == "alice"
+    assert not scans
+    assert registry.identify(_embedding(2)) == "bob"
+    assert len(scans) == 1
+
+
+def test_identify_sees_users_added_later() -> None:
+    """Test the stacked gallery is rebuilt after a new user is created."""
+    registry = FaceRegistry(_faces=[RegisteredFace("alice", [_embedding(1)])])
+    assert registry.identify(_embedding(1)) == "alice"
+
+    newcomer = _embedding(3)
+    for _ in range(3):
+        user_id = registry.identify(newcomer)
+    assert user_id.startswith("user_")
+    assert registry.identify(newcomer) == user_id
+
+
+def test_gallery_updated_in_place_at_capacity() -> None:
+    """Test matches on a full user rewrite its gallery rows to match a fresh restack."""
+    alice = RegisteredFace("alice", [_embedding(1) + 0.01 * i for i in range(MAX_EMBEDDINGS_PER_USER)])
+    registry = FaceRegistry(_faces=[RegisteredFace("bob", [_embedding(2)]), alice])
+    registry.identify(_embedding(1))
+    gallery = registry._gallery
+
+    registry.identify(_embedding(1) + 0.05)
+    assert registry._gallery is gallery
+    np.testing.assert_array_equal(gallery, FaceRegistry(_faces=registry._faces)._build_gallery()[0])
+
+
+def test_save_load_round_trip() -> None:
+    """Test embeddings survive an int8 save/load cycle, grouped by user."""
+    registry = FaceRegistry(
+        _faces=[
+            RegisteredFace("alice", [_embedding(1), _embedding(4)]),
+            RegisteredFace("bob", [_embedding(2)]),
+        ]
+    )
+    registry.save()
+
+    loaded = FaceRegistry.load()
+    assert [f.user_id for f in loaded._faces] == ["alice", "bob"]
+    for before, after in zip(registry._faces, loaded._faces):
+        assert after.embeddings.dtype == np.float32
+        np.testing.assert_allclose(after.embeddings, before.embeddings, atol=5e-3)
+        # Quantization must not move a stored face measurably in similarity
+        assert np.all(np.sum(after.embeddings * before.embeddings, axis=1) > 0.9999)
+
+
+def test_load_reads_float_npz(registry_path: Path) -> None:
+    """Test galleries saved before int8 quantization still load."""
+    np.savez(
+        registry_path,
+        gallery=_embedding(1)[None].astype(np.float16),
+        user_ids=np.array(["alice"]),
+        counts=np.array([1], dtype=np.int32),
+    )
+    assert FaceRegistry.load().identify(_embedding(1)) == "alice"
+
+
+def test_load_migrates_legacy_json(registry_path: Path) -> None:
+    """Test a legacy JSON registry is read when no NPZ exists, and saved as NPZ."""
+    face_registry.REGISTRY_PATH.write_text(
+        json.dumps({"faces": [{"user_id": "alice", "embedding": _embedding(1).tolist()}]})
+    )
+    registry = FaceRegistry.load()
+    assert registry.identify(_embedding(1)) == "alice"
+
+    registry.save()
+    assert registry_path.exists()
+    assert [f.user_id for f in FaceRegistry.load()._faces] == ["alice"]
+
+
+def test_identify_debounces_saves(registry_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test matched embeddings are saved at most every SAVE_INTERVAL, and on flush."""
+    now = [1000.0]
+    monkeypatch.setattr(face_registry.time, "monotonic", lambda: now[0])
+    registry = FaceRegistry(_faces=[RegisteredFace("alice", [_embedding(1)])], _last_save=now[0])
+
+    registry.identify(_embedding(1))
+    assert not registry_path.exists()
+
+    now[0] += SAVE_INTERVAL
+    registry.identify(_embedding(1))
+    assert registry_path.exists()
+    registry_path.unlink()
+
+    registry.identify(_embedding(1))
+    registry.flush()
+    assert len(FaceRegistry.load()._faces[0].embeddings) == 4
@@ -203,6 +203,8 @@ class WirelessConversation:
 
     async def stop(self):
         """Clean up all systems."""
+        if self.memory:
+            await self.memory.flush()
         if self.http_client:
             await self.http_client.aclose()
         if self.face_manager:
@@ -357,29 +359,28 @@ class WirelessConversation:
         api_key = STT_API_KEY or OPENAI_API_KEY
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {}
-                if api_key:
-                    headers["Authorization"] = f"Bearer {api_key}"
-
-                response = await client.post(
-                    STT_ENDPOINT,
-                    headers=headers,
-                    files={"file": ("audio.wav", audio_bytes, "audio/wav")},
-                    data={"model": STT_MODEL},
-                )
+            headers = {}
+            if api_key:
+                headers["Authorization"] = f"Bearer {api_key}"
 
-                if response.status_code == 200:
-                    result = response.json()
-                    text = result.get("text", "").strip()
+            response = await self.http_client.post(
+                STT_ENDPOINT,
+                headers=headers,
+                files={"file": ("audio.wav", audio_bytes, "audio/wav")},
+                data={"model": STT_MODEL},
+            )
 
-                    # Filter empty or hallucinated results
-                    if text and len(text) > 1 and text.lower() not in [
-                        "the", "a", "huh", "uh", "you", "thank you for watching"
-                    ]:
-                        return text
-                else:
-                    logger.error(f"Whisper API error: {response.status_code} - {response.text}")
+            if response.status_code == 200:
+                result = response.json()
+                text = result.get("text", "").strip()
+
+                # Filter empty or hallucinated results
+                if text and len(text) > 1 and text.lower() not in [
+                    "the", "a", "huh", "uh", "you", "thank you for watching"
+                ]:
+                    return text
+            else:
+                logger.error(f"Whisper API error: {response.status_code} - {response.text}")
 
         except Exception as e:
             logger.error(f"Transcription error: {e}")
@@ -540,14 +541,13 @@ class WirelessConversation:
                     logger.info("Playing audio via bridge...")
                     with open(wav_path, 'rb') as f:
                         wav_data = f.read()
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(
-                            "http://127.0.0.1:9000/play",
-                            content=wav_data,
-                            timeout=120.0  # Long timeout - bridge blocks until playback finishes
-                        )
-                        if response.status_code != 200:
-                            logger.error(f"Bridge error: {response.status_code}")
+                    response = await self.http_client.post(
+                        "http://127.0.0.1:9000/play",
+                        content=wav_data,
+                        timeout=120.0  # Long timeout - bridge blocks until playback finishes
+                    )
+                    if response.status_code != 200:
+                        logger.error(f"Bridge error: {response.status_code}")
                 except Exception as e:
                     logger.error(f"Bridge playback failed: {e}")
             finally:
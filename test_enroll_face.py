@@ -0,0 +1,24 @@
+"""Tests for enroll_face.py's batched encoding (needs face_recognition and dlib)."""
+
+import numpy as np
+import pytest
+
+face_recognition = pytest.importorskip("face_recognition")
+pytest.importorskip("cv2")
+
+from enroll_face import encode_faces  # noqa: E402
+
+
+def test_encode_faces_matches_face_encodings() -> None:
+    """Batched enrollment embeddings must equal the face_encodings ones used at runtime."""
+    rng = np.random.default_rng(0)
+    samples = []
+    for size in (200, 240):
+        rgb = rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8)
+        samples.append((rgb, [(20, size - 20, size - 20, 20)]))
+
+    batched = encode_faces(samples)
+    expected = [face_recognition.face_encodings(rgb, locations)[0] for rgb, locations in samples]
+    assert len(batched) == len(expected)
+    for got, want in zip(batched, expected):
+        np.testing.assert_allclose(got, want, atol=1e-6)
@@ -5,10 +5,11 @@ Falls back to HTTP camera for wireless operation.
 """
 
 import asyncio
+import inspect
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Awaitable, Callable, cast
 
 import cv2
 import numpy as np
@@ -33,8 +34,44 @@ except ImportError:
     FACE_RECOGNITION_AVAILABLE = False
     logger.warning("face_recognition not available - user identification disabled")
 
+# libjpeg-turbo (SIMD) for snapshot decoding, if installed
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+    _turbojpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+    TURBOJPEG_AVAILABLE = False
+
 MODEL_URL = "https://storage.googleapis.com/mediapipe-models/face_detector/blaze_face_short_range/float16/1/blaze_face_short_range.tflite"
 MODEL_PATH = Path("~/.reachy/models/blaze_face_short_range.tflite").expanduser()
+# Mean change of a frame's thumbnail, as a fraction of full scale, below
+# which it is treated as the same scene and not re-identified
+FRAME_CHANGE_THRESHOLD = 0.005
+
+# A blocking frame getter (run in a worker thread) or a coroutine function
+FrameSource = Callable[[], np.ndarray | None] | Callable[[], Awaitable[np.ndarray | None]]
+
+
+def frame_thumbnail(frame: np.ndarray) -> np.ndarray:
+    """Shrink a BGR frame to a 16x16 grayscale thumbnail for cheap change checks."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (16, 16), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def frames_similar(a: np.ndarray, b: np.ndarray) -> bool:
+    """Whether two frame thumbnails differ by less than FRAME_CHANGE_THRESHOLD."""
+    return float(np.abs(a - b).mean()) < FRAME_CHANGE_THRESHOLD * 255
+
+
+def decode_jpeg(data: bytes) -> np.ndarray | None:
+    """Decode JPEG bytes to a BGR frame, via libjpeg-turbo when available."""
+    frame: np.ndarray | None
+    if TURBOJPEG_AVAILABLE:
+        frame = _turbojpeg.decode(data, pixel_format=TJPF_BGR)
+    else:
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    return frame
 
 
 @dataclass
@@ -55,6 +92,7 @@ class HTTPCamera:
     def __init__(self, robot_ip: str, port: int = 9001):
         self.url = f"http://{robot_ip}:{port}/snapshot"
         self._client = None
+        self._sync_client = None  # Kept open so per-frame snapshots reuse the connection
 
     async def _ensure_client(self):
         if self._client is None:
@@ -67,9 +105,7 @@ class HTTPCamera:
         try:
             response = await self._client.get(self.url)
             if response.status_code == 200:
-                img_array = np.frombuffer(response.content, dtype=np.uint8)
-                frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                return frame
+                return await asyncio.to_thread(decode_jpeg, response.content)
         except Exception as e:
             logger.debug(f"HTTP camera error: {e}")
         return None
@@ -77,13 +113,12 @@ class HTTPCamera:
     def get_frame(self) -> np.ndarray | None:
         """Synchronous wrapper for compatibility."""
         try:
-            import httpx
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(self.url)
-                if response.status_code == 200:
-                    img_array = np.frombuffer(response.content, dtype=np.uint8)
-                    frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                    return frame
+            if self._sync_client is None:
+                import httpx
+                self._sync_client = httpx.Client(timeout=5.0)
+            response = self._sync_client.get(self.url)
+            if response.status_code == 200:
+                return decode_jpeg(response.content)
         except Exception as e:
             logger.debug(f"HTTP camera error: {e}")
         return None
@@ -92,6 +127,9 @@ class HTTPCamera:
         if self._client:
             await self._client.aclose()
             self._client = None
+        if self._sync_client:
+            self._sync_client.close()
+            self._sync_client = None
 
 
 async def _ensure_model() -> Path:
@@ -117,7 +155,7 @@ class VisionSystem:
 
     def __init__(
         self,
-        frame_source: Callable[[], np.ndarray | None] | None = None,
+        frame_source: FrameSource | None = None,
         robot_ip: str | None = None,
     ):
         self._frame_source = frame_source
@@ -126,11 +164,12 @@ class VisionSystem:
         self._face_detector = None
         self._running = False
         self._min_frame_interval_seconds = 0.02
+        self._rgb_buf: np.ndarray | None = None  # Reused by get_face_embedding
 
         # Initialize HTTP camera if no frame source and robot_ip provided
         if frame_source is None and robot_ip:
             self._http_camera = HTTPCamera(robot_ip)
-            self._frame_source = self._http_camera.get_frame
+            self._frame_source = self._http_camera.get_frame_async
             logger.info(f"VisionSystem using HTTP camera: {self._http_camera.url}")
 
     async def start(self) -> None:
@@ -166,7 +205,7 @@ class VisionSystem:
         if not self._frame_source or not self._face_detector:
             return []
 
-        frame = await asyncio.to_thread(self._frame_source)
+        frame = await self._read_frame()
 
         if frame is None:
             return []
@@ -177,10 +216,13 @@ class VisionSystem:
 
     def _detect_faces_sync(self, frame: np.ndarray) -> list[Face]:
         """Run synchronous face detection on a frame."""
+        return self._detect_faces_rgb(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    def _detect_faces_rgb(self, rgb_frame: np.ndarray) -> list[Face]:
+        """Run synchronous face detection on an already converted RGB frame."""
         if not self._face_detector or not MEDIAPIPE_AVAILABLE:
             return []
 
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
         result = self._face_detector.detect(mp_image)
 
@@ -201,7 +243,7 @@ class VisionSystem:
         if not self._frame_source:
             return None
 
-        frame = await asyncio.to_thread(self._frame_source)
+        frame = await self._read_frame()
         if frame is None:
             return None
 
@@ -217,26 +259,43 @@ class VisionSystem:
         _, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
         return encoded.tobytes()
 
-    async def get_face_embedding(self) -> np.ndarray | None:
+    async def capture_frame(self) -> np.ndarray | None:
+        """Grab the current BGR frame from the frame source."""
+        if not self._frame_source:
+            return None
+        return await self._read_frame()
+
+    async def _read_frame(self) -> np.ndarray | None:
+        """Read a frame, awaiting async sources and threading blocking ones."""
+        source = self._frame_source
+        if source is None:
+            return None
+        if inspect.iscoroutinefunction(source):
+            return await cast(Callable[[], Awaitable[np.ndarray | None]], source)()
+        return await asyncio.to_thread(cast(Callable[[], np.ndarray | None], source))
+
+    async def get_face_embedding(self, frame: np.ndarray | None = None) -> np.ndarray | None:
         """Extract face embedding for largest face in frame.
 
         Uses MediaPipe for detection (reliable) and face_recognition for embeddings.
+        Captures a new frame unless one is given.
         Returns None if face_recognition is not available.
         """
         if not FACE_RECOGNITION_AVAILABLE:
             logger.debug("Face recognition not available, skipping embedding")
             return None
 
-        if not self._frame_source:
-            return None
-
-        frame = await asyncio.to_thread(self._frame_source)
         if frame is None:
-            return None
+            frame = await self.capture_frame()
+            if frame is None:
+                return None
+
+        # Convert once, into a reused buffer, for both detection and embedding
+        rgb = await asyncio.to_thread(self._to_rgb, frame)
 
         # Use MediaPipe for face detection if available
         if self._face_detector and MEDIAPIPE_AVAILABLE:
-            faces = await asyncio.to_thread(self._detect_faces_sync, frame)
+            faces = await asyncio.to_thread(self._detect_faces_rgb, rgb)
             if not faces:
                 return None
 
@@ -246,24 +305,28 @@ class VisionSystem:
 
             # Convert MediaPipe bbox (x, y, w, h) to face_recognition format (top, right, bottom, left)
             location = (y, x + w, y + h, x)
-            return await asyncio.to_thread(self._extract_embedding_at_location, frame, location)
+            return await asyncio.to_thread(self._extract_embedding_at_location, rgb, location)
         else:
             # Fall back to face_recognition's own detection
-            return await asyncio.to_thread(self._extract_embedding_auto, frame)
+            return await asyncio.to_thread(self._extract_embedding_auto, rgb)
+
+    def _to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame into the reused RGB buffer."""
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
 
-    def _extract_embedding_at_location(self, frame: np.ndarray, location: tuple) -> np.ndarray | None:
-        """Extract face embedding at a known location."""
+    def _extract_embedding_at_location(self, rgb: np.ndarray, location: tuple) -> np.ndarray | None:
+        """Extract face embedding at a known location in an RGB frame."""
         if not FACE_RECOGNITION_AVAILABLE:
             return None
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         encodings = face_recognition.face_encodings(rgb, [location])
         return encodings[0] if encodings else None
 
-    def _extract_embedding_auto(self, frame: np.ndarray) -> np.ndarray | None:
-        """Extract face embedding using face_recognition's built-in detection."""
+    def _extract_embedding_auto(self, rgb: np.ndarray) -> np.ndarray | None:
+        """Extract face embedding from an RGB frame using face_recognition's built-in detection."""
         if not FACE_RECOGNITION_AVAILABLE:
             return None
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         encodings = face_recognition.face_encodings(rgb)
         return encodings[0] if encodings else None
 
@@ -285,6 +348,7 @@ class FaceIdentityManager:
         self.check_interval = check_interval
 
         self._current_user_id: str | None = None
+        self._last_thumbnail: np.ndarray | None = None  # Of the last frame actually identified
         self._running = False
         self._task: asyncio.Task | None = None
 
@@ -305,13 +369,28 @@ class FaceIdentityManager:
             except asyncio.CancelledError:
                 pass
         await self.vision.stop()
+        self.registry.flush()
         logger.info("Face identity manager stopped")
 
     async def _identify_loop(self) -> None:
         """Continuously identify faces."""
         while self._running:
             try:
-                embedding = await self.vision.get_face_embedding()
+                frame = await self.vision.capture_frame()
+                if frame is not None:
+                    thumbnail = frame_thumbnail(frame)
+                    if (
+                        self._current_user_id is not None
+                        and self._last_thumbnail is not None
+                        and frames_similar(thumbnail, self._last_thumbnail)
+                    ):
+                        # Same scene as the last identified frame: keep the current user
+                        await asyncio.sleep(self.check_interval)
+                        continue
+                    self._last_thumbnail = thumbnail
+                    embedding = await self.vision.get_face_embedding(frame)
+                else:
+                    embedding = None
                 user_id = self.registry.identify(embedding)
                 self._current_user_id = user_id
                 await asyncio.sleep(self.check_interval)